@@ -0,0 +1,59 @@
+"""
+Numerical core of the AHP Decision Companion.
+
+Importing the package is cheap: submodules (and NumPy) are loaded the first
+time one of the names below is used.
+"""
+import importlib
+import sys
+import types
+
+_EXPORTS = {
+    "core": ("CONSISTENCY_THRESHOLD", "aggregate", "build_matrix", "calculate_weights", "consistency_ratio",
+             "normalize_objective", "normalize_shift", "rank", "risk_adjusted"),
+    "eigen": ("EIGEN_METHODS", "geometric_mean_weights", "principal_eigen"),
+    "matrix": ("PairwiseMatrix", "upper_indices"),
+    "random_index": ("PUBLISHED_RI", "SIMULATED_RI", "random_index", "warm_random_index"),
+    "cache": ("LRUCache", "array_key", "canonical_hash"),
+    "sensitivity": ("perturbation_scores", "stability_intervals"),
+    "simulation": ("DISTRIBUTIONS", "simulate"),
+    "priority": ("GCI_THRESHOLD", "LOG_METHODS", "PRIORITY_METHODS", "geometric_consistency_index", "gci_threshold", "prioritize"),
+    "sparse": ("ComparisonGraph", "prioritize_triples", "sparse_prioritize"),
+    "group": ("AGGREGATION_METHODS", "aggregate_judgments", "aggregate_priorities", "group_prioritize", "kendall_w"),
+    "hierarchy": ("hierarchy_weights", "solve_hierarchy"),
+    "repair": ("judgment_errors", "repair_suggestions"),
+    "mcdm": ("SCORING_METHODS", "method_report", "method_scores", "promethee", "topsis", "vikor"),
+    "model": ("NORMALIZATIONS", "ScoringModel"),
+    "screening": ("open_matrix", "screen", "screen_problem"),
+    "session": ("DecisionSession",),
+    "pipeline": ("alternative_weights", "assemble_stages", "criteria_weights", "evaluate", "iter_stages"),
+    "batch": ("evaluate_batch",),
+}
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULE_OF)
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+class _Package(types.ModuleType):
+    # the import system binds each loaded submodule on the package; keep the
+    # function when an export shares its submodule's name (random_index)
+    def __setattr__(self, name, value):
+        if isinstance(value, types.ModuleType) and name in _MODULE_OF:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
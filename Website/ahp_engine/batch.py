@@ -0,0 +1,177 @@
+"""
+Vectorized scoring of many problems at once (/api/calculate-batch).
+
+Problems with the same number of alternatives, per-criterion mode/type and
+eigen/priority method are stacked, so every matrix solve runs on a (B, n, n) array
+and normalisation, aggregation and ranking are single array operations.
+"""
+import numpy as np
+
+from .core import (as_list, build_matrix, calculate_weights, consistency_ratio, normalize_objective, normalize_shift,
+                   rank, risk_adjusted)
+from .hierarchy import hierarchy_weights
+from .matrix import PairwiseMatrix
+from .mcdm import method_report, method_scores
+from .priority import LOG_METHODS, geometric_consistency_index
+from .pipeline import consistent
+from .sensitivity import perturbation_scores
+from .sparse import prioritize_triples
+
+
+def _alt_triples(problem: dict, i: int):
+    triples = problem.get("alt_triples") or []
+    return triples[i] if i < len(triples) else None
+
+
+def group_key(problem: dict) -> tuple:
+    # sparse judgments are solved per problem, but must not share a group with dense ones
+    return (len(problem["alternatives"]),
+            tuple((c["mode"], c["type"], _alt_triples(problem, i) is not None) for i, c in enumerate(problem["criteria"])),
+            problem.get("criteria_triples") is not None, problem.get("criteria_tree") is not None,
+            problem.get("eigen_method", "auto"), problem.get("priority_method", "eigenvector"),
+            problem.get("scoring_method", "wsm"), tuple(sorted((problem.get("scoring") or {}).items())))
+
+
+def sparse_rows(n: int, triples_list, priority: str, inverted: bool = False):
+    """Per-problem sparse solves stacked as (weights, CR, GCI) arrays; a missing CR becomes NaN."""
+    rows = [prioritize_triples(n, triples, priority, inverted) for triples in triples_list]
+    return (np.array([w for w, _, _ in rows]), np.array([np.nan if cr is None else cr for _, cr, _ in rows]),
+            np.array([gci for _, _, gci in rows]))
+
+
+def evaluate_batch(problems, compact: bool = False) -> list:
+    """
+    Score a list of AHPRequest-layout dicts; results come back in input order.
+    Results are those of /api/calculate without stability, which is a
+    per-problem analysis; a problem that asks for a simulation is rejected.
+    """
+    groups = {}
+    for idx, p in enumerate(problems):
+        if p.get("simulation") is not None:
+            raise ValueError(f"Problem {idx}: batches do not run simulations; post it to /api/calculate instead.")
+        groups.setdefault(group_key(p), []).append(idx)
+
+    results = [None] * len(problems)
+    for indices in groups.values():
+        for idx, res in zip(indices, solve_group([problems[k] for k in indices], compact)):
+            results[idx] = res
+    return results
+
+
+def solve_group(problems, compact: bool = False) -> list:
+    """Score same-shaped problems together: every matrix solve runs on a stacked (B, n, n) array."""
+    first = problems[0]
+    B, n_criteria, n_alt = len(problems), len(first["criteria"]), len(first["alternatives"])
+    method = first.get("eigen_method", "auto")
+    priority = first.get("priority_method", "eigenvector")
+    log_method = priority in LOG_METHODS
+
+    hierarchies = None
+    if first.get("criteria_tree") is not None:
+        # shared-model blocks all reference one tree, which is solved once
+        trees, solved = {}, []
+        for p in problems:
+            key = (id(p["criteria_tree"]), tuple(c["name"] for c in p["criteria"]))
+            if key not in trees:
+                trees[key] = hierarchy_weights(p["criteria_tree"], p["criteria"], method, priority)
+            solved.append(trees[key])
+        hierarchies = [report for _, report in solved]
+        crit_weights = np.array([w for w, _ in solved])
+        crit_cr, crit_gci = np.array([h["max_cr"] for h in hierarchies]), np.full(B, np.nan)
+    elif first.get("criteria_triples") is not None:
+        crit_weights, crit_cr, crit_gci = sparse_rows(n_criteria, [p["criteria_triples"] for p in problems], priority)
+    else:
+        # identical criteria judgments (the shared-model case) are solved once
+        comps, inverse = np.unique(np.array([p["criteria_comparisons"] for p in problems], dtype=float).reshape(B, -1),
+                                   axis=0, return_inverse=True)
+        unique_matrices = build_matrix(n_criteria, comps)
+        uw, ul = calculate_weights(unique_matrices, method, priority)
+        inverse = inverse.reshape(-1)
+        crit_weights, crit_lmax = uw[inverse], ul[inverse]
+        crit_cr = consistency_ratio(n_criteria, crit_lmax)
+        crit_gci = geometric_consistency_index(unique_matrices, uw)[inverse] if log_method else np.full(B, np.nan)
+
+    alt_weights = np.empty((B, n_criteria, n_alt))
+    alt_crs = np.full((B, n_criteria), np.nan)
+    alt_gcis = np.full((B, n_criteria), np.nan)
+    uncertain_details = [[None] * n_criteria for _ in range(B)]
+
+    for i, criterion in enumerate(first["criteria"]):
+
+        if criterion["mode"] == "objective":
+            alt_weights[:, i] = normalize_objective([p["alt_data"][i] for p in problems], criterion["type"])
+
+        elif criterion["mode"] == "subjective" and _alt_triples(first, i) is not None:
+            alt_weights[:, i], alt_crs[:, i], alt_gcis[:, i] = sparse_rows(
+                n_alt, [_alt_triples(p, i) for p in problems], priority, criterion["type"] == "cost")
+
+        elif criterion["mode"] == "subjective":
+            matrices = PairwiseMatrix.from_upper(n_alt, [p["alt_data"][i] for p in problems])
+            if criterion["type"] == "cost":
+                matrices = matrices.inverted()
+            w, lmax = calculate_weights(matrices.values, method, priority)
+            alt_weights[:, i] = w
+            alt_crs[:, i] = consistency_ratio(n_alt, lmax)
+            if log_method:
+                alt_gcis[:, i] = geometric_consistency_index(matrices.values, w)
+
+        else:  # uncertain
+            uds = [p["uncertain_data"][i] if p.get("uncertain_data") else None for p in problems]
+            has = np.array([ud is not None for ud in uds])
+            alt_weights[~has, i] = 1.0 / n_alt
+            if has.any():
+                present = [ud for ud in uds if ud is not None]
+                adjusted = risk_adjusted([ud["means"] for ud in present], [ud["variances"] for ud in present],
+                                         [ud["risk_factor"] for ud in present])
+                alt_weights[has, i] = normalize_shift(adjusted)
+                for b, ud, adj in zip(np.flatnonzero(has), present, adjusted.tolist()):
+                    uncertain_details[b][i] = {"means": as_list(ud["means"]),
+                                               "variances": as_list(ud["variances"]),
+                                               "risk_factor": ud["risk_factor"], "adjusted": adj}
+
+    contributions = crit_weights[:, :, None] * alt_weights
+    final_scores = contributions.sum(axis=1)
+    rankings = rank(final_scores)
+    best_idx = np.argmax(final_scores, axis=1)
+    scoring_method = first.get("scoring_method", "wsm")
+    if scoring_method != "wsm":
+        methods = method_scores(scoring_method, crit_weights, alt_weights, first.get("scoring"), final_scores)
+
+    if not compact:
+        new_scores = perturbation_scores(crit_weights, alt_weights)
+        new_best = np.argmax(new_scores, axis=2)
+
+    # one tolist() per array instead of one per problem
+    cw_l, aw_l = crit_weights.tolist(), alt_weights.tolist()
+    cr_l = np.where(np.isnan(crit_cr), None, crit_cr).tolist()
+    consistent_l = [consistent(n_criteria, cr, gci) for cr, gci in zip(cr_l, crit_gci.tolist())]
+    fs_l, rk_l, best_l = final_scores.tolist(), rankings.tolist(), best_idx.tolist()
+    crs_l = np.where(np.isnan(alt_crs), None, alt_crs).tolist()
+    gci_l = np.where(np.isnan(crit_gci), None, crit_gci).tolist()
+    gcis_l = np.where(np.isnan(alt_gcis), None, alt_gcis).tolist()
+    if not compact:
+        contrib_l, nb_l, ns_l = contributions.tolist(), new_best.tolist(), new_scores.tolist()
+
+    results = []
+    for b, p in enumerate(problems):
+        alternatives = p["alternatives"]
+        res = {
+            "decision": p["decision"], "priority_method": priority,
+            "criteria_weights": cw_l[b], "criteria_cr": cr_l[b], "criteria_consistent": consistent_l[b],
+            "criteria_gci": gci_l[b], "alt_weights_list": aw_l[b], "alt_crs": crs_l[b], "alt_gcis": gcis_l[b],
+            "final_scores": fs_l[b], "ranking": rk_l[b], "best": alternatives[rk_l[b][0]],
+            "uncertain_details": uncertain_details[b]
+        }
+        if scoring_method != "wsm":
+            res.update(method_report(scoring_method, methods, alternatives, b))
+        if not compact:
+            original_best = alternatives[best_l[b]]
+            res["detailed_scores"] = {c["name"]: row for c, row in zip(p["criteria"], contrib_l[b])}
+            res["sensitivity"] = [
+                {"criterion": c["name"], "original_best": original_best, "new_best": alternatives[nb],
+                 "stable": alternatives[nb] == original_best, "new_scores": ns}
+                for c, nb, ns in zip(p["criteria"], nb_l[b], ns_l[b])]
+            if hierarchies is not None:
+                res["criteria_hierarchy"] = hierarchies[b]
+        results.append(res)
+    return results
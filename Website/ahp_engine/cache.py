@@ -0,0 +1,88 @@
+"""
+Small thread-safe LRU cache with optional TTL and hit/miss counters, plus
+helpers for building canonical keys from request bodies and matrices.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _digest_default(obj):
+    if isinstance(obj, np.ndarray):
+        # arrays from binary request bodies: digest the buffer instead of listing every value
+        arr = np.ascontiguousarray(obj)
+        return {"ndarray": [arr.shape, arr.dtype.str, hashlib.blake2b(arr.tobytes(), digest_size=16).hexdigest()]}
+    return str(obj)
+
+
+def canonical_hash(obj) -> str:
+    """Stable digest of a JSON-compatible object, independent of key order and whitespace."""
+    payload = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=_digest_default)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def array_key(arr: np.ndarray, *extra) -> tuple:
+    arr = np.ascontiguousarray(arr)
+    return (arr.shape, str(arr.dtype), hashlib.blake2b(arr.tobytes(), digest_size=16).digest()) + extra
+
+
+class LRUCache:
+    """maxsize=0 disables the cache; ttl=None keeps entries until evicted."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and (self.ttl is None or time.monotonic() - entry[0] < self.ttl):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize,
+                "ttl": self.ttl, "hit_rate": self.hits / lookups if lookups else 0.0}
@@ -0,0 +1,70 @@
+"""
+AHP building blocks shared by the web app, the CLI and the batch paths.
+
+Every function works on a single problem and, where it makes sense, on a
+leading batch axis as well (normalisations act on the last axis).
+"""
+import numpy as np
+
+from .matrix import PairwiseMatrix
+from .priority import prioritize
+from .random_index import random_index
+
+CONSISTENCY_THRESHOLD = 0.1
+
+
+def calculate_weights(matrix: np.ndarray, method: str = "auto", priority_method: str = "eigenvector"):
+    """
+    Priority vector and lambda_max of a pairwise matrix (or a stack of them).
+    method is the eigen solver used by the "eigenvector" priority method.
+    """
+    return prioritize(matrix, priority_method, method)
+
+
+def consistency_ratio(n: int, lambda_max):
+    if n < 3:
+        return np.zeros_like(lambda_max) if np.ndim(lambda_max) else 0.0
+    CI = (lambda_max - n) / (n - 1)
+    return CI / random_index(n)
+
+
+def build_matrix(n: int, comparisons) -> np.ndarray:
+    return PairwiseMatrix.from_upper(n, comparisons).values
+
+
+def normalize_objective(values, criterion_type: str) -> np.ndarray:
+    arr = np.asarray(values, dtype=float)
+    if criterion_type != "benefit":
+        arr = 1.0 / arr
+    return arr / np.sum(arr, axis=-1, keepdims=True)
+
+
+def normalize_shift(values) -> np.ndarray:
+    """
+    Used for uncertain criteria in case adjusted values become negative.
+    Shifts them to positive before normalization.
+    """
+    arr = np.asarray(values, dtype=float)
+    min_val = np.min(arr, axis=-1, keepdims=True)
+    arr = np.where(min_val <= 0, arr - min_val + 0.0001, arr)
+    return arr / np.sum(arr, axis=-1, keepdims=True)
+
+
+def risk_adjusted(means, variances, risk_factor) -> np.ndarray:
+    """Mean-variance score: mean - risk_factor * variance."""
+    return np.asarray(means, dtype=float) - np.asarray(risk_factor, dtype=float)[..., None] * np.asarray(variances, dtype=float)
+
+
+def aggregate(crit_weights, alt_weights) -> np.ndarray:
+    """Weighted sum: criteria weights (..., c) times alternative weights (..., c, m)."""
+    return np.einsum("...c,...cm->...m", np.asarray(crit_weights, dtype=float), np.asarray(alt_weights, dtype=float))
+
+
+def as_list(values):
+    """Plain lists for echoing input back: typed (MessagePack) arrays arrive as ndarrays."""
+    return values.tolist() if isinstance(values, np.ndarray) else values
+
+
+def rank(scores) -> np.ndarray:
+    """Best-first ordering (ties keep the reverse of argsort's order, as before)."""
+    return np.argsort(scores, axis=-1)[..., ::-1]
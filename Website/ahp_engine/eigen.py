@@ -0,0 +1,137 @@
+"""
+Principal (Perron) eigenvector solvers for positive reciprocal matrices.
+
+AHP only ever needs the dominant eigenpair, so computing the full spectrum
+with np.linalg.eig is wasted work. Every solver here accepts a single
+(n, n) matrix or a stack of shape (B, n, n) and returns weights normalised
+to sum to 1 together with lambda_max.
+
+    auto      eig for small matrices, power iteration from AUTO_POWER_MIN_N up
+    eig       full dense eigendecomposition (reference)
+    power     power iteration, warm-started from the row geometric mean
+    rqi       Rayleigh-quotient (shifted inverse) iteration, few but O(n^3) steps
+    log_eigh  symmetric eigh on the geometric-mean-balanced matrix; exact for
+              consistent matrices, approximate for near-consistent ones
+"""
+import numpy as np
+
+EIGEN_METHODS = ("auto", "eig", "power", "rqi", "log_eigh")
+
+# measured crossover: for n below this LAPACK's eig beats the per-iteration
+# overhead of power iteration on inconsistent (random) matrices, which need
+# 20-40 steps; near-consistent ones converge in under 10 and cross earlier
+AUTO_POWER_MIN_N = 20
+
+
+def geometric_mean_weights(matrices: np.ndarray) -> np.ndarray:
+    g = np.exp(np.mean(np.log(matrices), axis=-1))
+    return g / np.sum(g, axis=-1, keepdims=True)
+
+
+def _matvec(matrices, x):
+    # einsum beats a stacked matmul for the small matrices AHP produces
+    return np.einsum("...ij,...j->...i", matrices, x)
+
+
+def _rayleigh(matrices, x):
+    # with sum(x) == 1 the 1-norm quotient sum(Ax)/sum(x) is just sum(Ax)
+    return np.sum(_matvec(matrices, x), axis=-1)
+
+
+def _eig(matrices, **_):
+    eigenvalues, eigenvectors = np.linalg.eig(matrices)
+    max_index = np.argmax(eigenvalues.real, axis=-1)
+    lambda_max = np.take_along_axis(eigenvalues.real, max_index[..., None], axis=-1)[..., 0]
+    weights = np.take_along_axis(eigenvectors.real, max_index[..., None, None], axis=-1)[..., 0]
+    return weights / np.sum(weights, axis=-1, keepdims=True), lambda_max
+
+
+def _power(matrices, x, tol, max_iter):
+    if matrices.shape[0] == 1:
+        # a single matrix: plain 2D matmul skips the einsum/broadcast overhead,
+        # which dominates each step at AHP sizes
+        a, v = matrices[0], x[0]
+        for _ in range(max_iter):
+            y = a @ v
+            y /= y.sum()
+            done = np.abs(y - v).max() < tol
+            v = y
+            if done:
+                break
+        return v[None], np.array([(a @ v).sum()])
+    for _ in range(max_iter):
+        y = _matvec(matrices, x)
+        y /= np.sum(y, axis=-1, keepdims=True)
+        done = np.max(np.abs(y - x)) < tol
+        x = y
+        if done:
+            break
+    return x, _rayleigh(matrices, x)
+
+
+def _rqi(matrices, x, tol, max_iter):
+    x = x.copy()
+    eye = np.eye(matrices.shape[-1])
+    active = np.arange(matrices.shape[0])
+    for _ in range(max_iter):
+        a, xa = matrices[active], x[active]
+        mu = _rayleigh(a, xa)
+        residual = np.max(np.abs(_matvec(a, xa) - mu[:, None] * xa), axis=-1)
+        active = active[residual >= tol]
+        if active.size == 0:
+            break
+        a, xa, mu = matrices[active], x[active], mu[residual >= tol]
+        shifted = a - mu[:, None, None] * eye
+        # a shift that hits lambda_max exactly leaves a singular system, and
+        # in that case xa already is the eigenvector
+        # (slogdet rather than det, which overflows to inf for large n)
+        sign, logdet = np.linalg.slogdet(shifted)
+        ok = (sign != 0) & np.isfinite(logdet)
+        y = np.abs(np.linalg.solve(shifted[ok], xa[ok][..., None])[..., 0])
+        x[active[ok]] = y / np.sum(y, axis=-1, keepdims=True)
+        active = active[ok]
+    return x, _rayleigh(matrices, x)
+
+
+def _log_eigh(matrices, x, tol, max_iter):
+    # D^-1 A D with D = diag(geometric mean) is the all-ones matrix when A is
+    # consistent; for near-consistent A its symmetric part carries the same
+    # Perron vector to second order, and that part can go through eigh.
+    balanced = matrices * x[..., None, :] / x[..., :, None]
+    sym = 0.5 * (balanced + np.swapaxes(balanced, -1, -2))
+    _, vectors = np.linalg.eigh(sym)
+    w = x * np.abs(vectors[..., -1])
+    w /= np.sum(w, axis=-1, keepdims=True)
+    return w, _rayleigh(matrices, w)
+
+
+_SOLVERS = {"power": _power, "rqi": _rqi, "log_eigh": _log_eigh}
+
+
+def principal_eigen(matrices: np.ndarray, method: str = "auto", tol: float = 1e-10,
+                    max_iter: int = 1000, x0: np.ndarray = None):
+    """
+    Dominant eigenpair of one matrix (n, n) or a stack (B, n, n).
+    x0 warm-starts the iterative methods (e.g. the previous solution after a
+    single judgment changed); it defaults to the row geometric mean.
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    single = matrices.ndim == 2
+    if single:
+        matrices = matrices[None]
+    if method == "auto":
+        method = "power" if matrices.shape[-1] >= AUTO_POWER_MIN_N else "eig"
+    if method == "eig":
+        weights, lambda_max = _eig(matrices)
+    elif method in _SOLVERS:
+        if x0 is None:
+            x0 = geometric_mean_weights(matrices)
+        else:
+            x0 = np.broadcast_to(np.asarray(x0, dtype=float), matrices.shape[:-1])
+            x0 = x0 / np.sum(x0, axis=-1, keepdims=True)
+        weights, lambda_max = _SOLVERS[method](matrices, x0, tol, max_iter)
+    else:
+        raise ValueError(f"Unknown eigen method '{method}'. Use one of {EIGEN_METHODS}.")
+    if single:
+        return weights[0], float(lambda_max[0])
+    return weights, lambda_max
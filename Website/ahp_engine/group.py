@@ -0,0 +1,123 @@
+"""
+Group decisions: one set of pairwise judgments per evaluator, combined into group priorities.
+
+    aij  aggregation of individual judgments: the (weighted) geometric mean of
+         the evaluators' matrices, then one priority solve. Entries an
+         evaluator left out (0) are averaged over the evaluators who gave them;
+         a pair nobody judged stays missing. Only llsm solves matrices with
+         missing entries, so other priority methods need complete judgments.
+    aip  aggregation of individual priorities: every evaluator's matrix is
+         solved (as one (E, n, n) stack) and the priority vectors are combined
+         by weighted geometric mean.
+
+Both return the same report. Individual CR and GCI are computed from the
+stacked solve. Group consistency is measured on the AIJ matrix with the group
+weights. For consensus, the report gives each evaluator's geometric
+compatibility index (GCOMPI, GCI of their judgments against the group
+weights), Kendall's W over the individual rankings, and the weighted spread of
+the individual priorities.
+"""
+import numpy as np
+
+from .core import CONSISTENCY_THRESHOLD, consistency_ratio
+from .matrix import PairwiseMatrix, upper_indices
+from .priority import _present, gci_threshold, geometric_consistency_index, lambda_from_weights, prioritize
+
+AGGREGATION_METHODS = ("aij", "aip")
+
+
+def evaluator_shares(n_evaluators: int, evaluator_weights=None) -> np.ndarray:
+    """Evaluator weights normalised to sum 1 (equal weights by default)."""
+    if evaluator_weights is None:
+        return np.full(n_evaluators, 1.0 / n_evaluators)
+    shares = np.asarray(evaluator_weights, dtype=float)
+    if shares.shape != (n_evaluators,):
+        raise ValueError(f"Expected {n_evaluators} evaluator weights, got {shares.size}.")
+    if np.any(~np.isfinite(shares) | (shares < 0)) or not shares.sum() > 0:
+        raise ValueError("Evaluator weights must be non-negative with a positive sum.")
+    return shares / shares.sum()
+
+
+def aggregate_judgments(matrices: np.ndarray, shares: np.ndarray) -> np.ndarray:
+    """Weighted geometric mean of (E, n, n) matrices; an entry no evaluator gave stays 0 (missing)."""
+    present = _present(matrices)
+    logs = np.log(np.where(present, matrices, 1.0))
+    mass = np.einsum("e,eij->ij", shares, present)
+    total = np.einsum("e,eij->ij", shares, np.where(present, logs, 0.0))
+    return np.where(mass > 0, np.exp(total / np.where(mass > 0, mass, 1.0)), 0.0)
+
+
+def aggregate_priorities(weights: np.ndarray, shares: np.ndarray) -> np.ndarray:
+    """Weighted geometric mean of (E, n) priority vectors, renormalised to sum 1."""
+    g = np.exp(shares @ np.log(weights))
+    return g / g.sum()
+
+
+def kendall_w(weights: np.ndarray) -> float:
+    """Kendall's coefficient of concordance of the rankings the (E, n) priority vectors imply (1 = full agreement)."""
+    E, n = weights.shape
+    if E < 2 or n < 2:
+        return 1.0
+    ranks = np.argsort(np.argsort(-weights, axis=-1, kind="stable"), axis=-1) + 1
+    spread = ranks.sum(axis=0) - E * (n + 1) / 2
+    return float(12.0 * np.sum(spread ** 2) / (E ** 2 * (n ** 3 - n)))
+
+
+def group_prioritize(comparisons, n: int, aggregation: str = "aij", evaluator_weights=None,
+                     eigen_method: str = "auto", priority_method: str = "eigenvector",
+                     individual: bool = False) -> dict:
+    """
+    Group priorities from (E, n(n-1)/2) upper-triangle comparisons, one row per
+    evaluator (0 = judgment not given, llsm only). individual=True adds the
+    per-evaluator weights to the report.
+    """
+    if aggregation not in AGGREGATION_METHODS:
+        raise ValueError(f"Unknown aggregation '{aggregation}'. Use one of {AGGREGATION_METHODS}.")
+    comparisons = np.asarray(comparisons, dtype=float)
+    if comparisons.ndim != 2 or comparisons.shape[0] == 0:
+        raise ValueError("Group comparisons must be a non-empty list with one comparison list per evaluator.")
+    matrices = PairwiseMatrix.from_upper(n, comparisons).values
+    if priority_method != "llsm" and not _present(matrices).all():
+        raise ValueError("Some evaluators left judgments out (0 or non-positive); incomplete group comparisons "
+                         "need the 'llsm' priority method.")
+    E = matrices.shape[0]
+    shares = evaluator_shares(E, evaluator_weights)
+
+    ind_weights, ind_lmax = prioritize(matrices, priority_method, eigen_method)
+    ind_cr = consistency_ratio(n, ind_lmax)
+    ind_gci = geometric_consistency_index(matrices, ind_weights)
+
+    group_matrix = aggregate_judgments(matrices, shares)
+    if aggregation == "aij":
+        weights, lmax = prioritize(group_matrix, priority_method, eigen_method)
+    else:
+        weights = aggregate_priorities(ind_weights, shares)
+        lmax = float(lambda_from_weights(np.where(_present(group_matrix), group_matrix,
+                                                  weights[:, None] / weights[None, :]), weights))
+    cr = float(consistency_ratio(n, lmax))
+    gci = geometric_consistency_index(group_matrix, weights)
+
+    # GCOMPI: each evaluator's judgments measured against the group priorities
+    compatibility = geometric_consistency_index(matrices, np.broadcast_to(weights, (E, n)))
+    compatibility = np.atleast_1d(compatibility)
+    spread = np.sqrt(shares @ (ind_weights - weights) ** 2)
+    iu, ju = upper_indices(n)
+
+    report = {
+        "aggregation": aggregation, "priority_method": priority_method, "evaluators": E,
+        "weights": weights.tolist(), "lambda_max": float(lmax), "consistency_ratio": cr,
+        "consistent": cr <= CONSISTENCY_THRESHOLD, "gci": float(gci),
+        "group_comparisons": group_matrix[iu, ju].tolist(),
+        "individual_cr": ind_cr.tolist(), "individual_gci": np.atleast_1d(ind_gci).tolist(),
+        "consistent_share": float(shares @ (ind_cr <= CONSISTENCY_THRESHOLD)),
+        "consensus": {
+            "compatibility": compatibility.tolist(),
+            "mean_compatibility": float(shares @ compatibility),
+            "compatible_share": float(shares @ (compatibility <= gci_threshold(n))),
+            "kendall_w": kendall_w(ind_weights),
+            "weight_spread": spread.tolist(),
+        },
+    }
+    if individual:
+        report["individual_weights"] = ind_weights.tolist()
+    return report
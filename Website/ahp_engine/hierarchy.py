@@ -0,0 +1,132 @@
+"""
+Multi-level criteria: a tree of nodes, each comparing its own children.
+
+A node is a dict {"name", "comparisons", "children"}. The comparisons are
+the row-major upper triangle over the node's children, and a node without
+children is a leaf, i.e. a criterion that alternatives are scored on. A node
+with a single child passes its whole weight down and needs no comparisons.
+
+The tree is flattened breadth first, so every node's children are contiguous
+and come after their parent. All node matrices of the same size are then
+solved as one (k, n, n) stack, and global weights are propagated one depth
+level at a time with a gather and a multiply:
+
+    global[level] = global[parent[level]] * local[level]
+
+so the number of solver calls is the number of distinct node sizes, and the
+number of propagation steps is the depth of the tree.
+"""
+import numpy as np
+
+from .core import CONSISTENCY_THRESHOLD, calculate_weights, consistency_ratio
+from .matrix import PairwiseMatrix
+from .priority import LOG_METHODS, geometric_consistency_index
+
+
+def flatten(tree: dict):
+    """Breadth-first nodes, parent index (-1 for the root), depth and index of the first child."""
+    nodes, parent, depth, first = [tree], [-1], [0], []
+    k = 0
+    while k < len(nodes):
+        children = nodes[k].get("children") or []
+        first.append(len(nodes))
+        nodes.extend(children)
+        parent.extend([k] * len(children))
+        depth.extend([depth[k] + 1] * len(children))
+        k += 1
+    return nodes, np.array(parent), np.array(depth), np.array(first)
+
+
+def propagate(local: np.ndarray, parent: np.ndarray, depth: np.ndarray) -> np.ndarray:
+    """Global weights from local ones; nodes are in breadth-first order, so each level only needs its parents'."""
+    glob = local.copy()
+    for d in range(1, int(depth.max()) + 1):
+        level = depth == d
+        glob[level] *= glob[parent[level]]
+    return glob
+
+
+def solve_hierarchy(tree: dict, eigen_method: str = "auto", priority_method: str = "eigenvector",
+                    solve=calculate_weights) -> dict:
+    """
+    Local and global weights of every node, per-node consistency, and the leaf
+    (criterion) weights in depth-first order. solve(matrices, eigen_method,
+    priority_method) is called once per distinct node size with a (k, n, n) stack.
+    """
+    nodes, parent, depth, first = flatten(tree)
+    sizes = np.array([len(node.get("children") or []) for node in nodes])
+    N = len(nodes)
+    local = np.ones(N)
+    cr, gci, lmax = np.full(N, np.nan), np.full(N, np.nan), np.full(N, np.nan)
+
+    for n in np.unique(sizes[sizes > 1]).tolist():
+        idx = np.flatnonzero(sizes == n)
+        comps = []
+        for k in idx.tolist():
+            c = nodes[k].get("comparisons") or []
+            if len(c) != n * (n - 1) // 2:
+                raise ValueError(f"Node '{nodes[k]['name']}' has {n} children and needs {n * (n - 1) // 2} "
+                                 f"comparisons, got {len(c)}.")
+            comps.append(c)
+        matrices = PairwiseMatrix.from_upper(n, comps).values
+        weights, lambda_max = solve(matrices, eigen_method, priority_method)
+        local[first[idx][:, None] + np.arange(n)] = weights
+        lmax[idx] = lambda_max
+        cr[idx] = consistency_ratio(n, np.asarray(lambda_max))
+        if priority_method in LOG_METHODS:
+            gci[idx] = geometric_consistency_index(matrices, weights)
+
+    glob = propagate(local, parent, depth)
+    leaf = sizes == 0
+    leaves = leaf_order(nodes, first, sizes)
+    names = [node["name"] for node in nodes]
+    if len(set(names[k] for k in leaves)) != len(leaves):
+        raise ValueError("Leaf criteria names in the hierarchy must be unique.")
+
+    cr_l = np.where(np.isnan(cr), None, cr).tolist()
+    gci_l = np.where(np.isnan(gci), None, gci).tolist()
+    lmax_l = np.where(np.isnan(lmax), None, lmax).tolist()
+    paths = [[names[0]]]
+    for k in range(1, N):
+        paths.append(paths[parent[k]] + [names[k]])
+    rows = [{"name": names[k], "path": paths[k], "depth": int(depth[k]), "parent": int(parent[k]),
+             "local_weight": w, "global_weight": g, "leaf": bool(leaf[k]), "lambda_max": lmax_l[k],
+             "cr": cr_l[k], "consistent": None if cr_l[k] is None else cr_l[k] <= CONSISTENCY_THRESHOLD,
+             "gci": gci_l[k]}
+            for k, w, g in zip(range(N), local.tolist(), glob.tolist())]
+    solved = ~np.isnan(cr)
+    return {
+        "priority_method": priority_method, "nodes": rows,
+        "leaves": [names[k] for k in leaves], "leaf_weights": glob[leaves].tolist(),
+        "max_cr": float(cr[solved].max()) if solved.any() else 0.0,
+        "consistent": bool(np.all(cr[solved] <= CONSISTENCY_THRESHOLD)),
+        "inconsistent_nodes": [names[k] for k in np.flatnonzero(solved & (np.nan_to_num(cr) > CONSISTENCY_THRESHOLD))],
+    }
+
+
+def leaf_order(nodes, first, sizes) -> list:
+    """Leaf indices in depth-first (reading) order."""
+    out, stack = [], [0]
+    while stack:
+        k = stack.pop()
+        if sizes[k] == 0:
+            out.append(k)
+        else:
+            stack.extend(range(first[k] + sizes[k] - 1, first[k] - 1, -1))
+    return out
+
+
+def hierarchy_weights(tree: dict, criteria, eigen_method: str = "auto", priority_method: str = "eigenvector",
+                      solve=calculate_weights):
+    """
+    Criteria weights of a flat criteria list from the leaves of its hierarchy,
+    matched by name, plus the hierarchy report.
+    """
+    report = solve_hierarchy(tree, eigen_method, priority_method, solve)
+    position = {name: k for k, name in enumerate(report["leaves"])}
+    names = [c["name"] for c in criteria]
+    missing = [name for name in names if name not in position]
+    if missing or len(names) != len(position):
+        raise ValueError(f"The hierarchy leaves {report['leaves']} must match the criteria {names} one to one.")
+    weights = np.asarray(report["leaf_weights"])[[position[name] for name in names]]
+    return weights, report
@@ -0,0 +1,80 @@
+"""
+Positive reciprocal pairwise-comparison matrices.
+
+Judgments arrive as the row-major upper triangle (what the UI and API
+send), as a full matrix, or as a sparse list of (i, j, value) triples.
+All constructors fill the matrix with index arrays instead of Python
+loops and accept stacks of problems (a leading batch axis).
+"""
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def upper_indices(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Row-major upper-triangle indices, in the same order as the comparison lists."""
+    return np.triu_indices(n, k=1)
+
+
+class PairwiseMatrix:
+    """Reciprocal comparison matrix of shape (n, n), or a stack (..., n, n)."""
+
+    def __init__(self, values: np.ndarray):
+        self.values = values
+
+    @property
+    def n(self) -> int:
+        return self.values.shape[-1]
+
+    def __array__(self, dtype=None, copy=None):
+        return self.values if dtype is None else self.values.astype(dtype)
+
+    @classmethod
+    def from_upper(cls, n: int, comparisons) -> "PairwiseMatrix":
+        comparisons = np.asarray(comparisons, dtype=float)
+        if comparisons.shape[-1] != n * (n - 1) // 2:
+            raise ValueError(f"Expected {n * (n - 1) // 2} comparisons for n={n}, got {comparisons.shape[-1]}.")
+        iu, ju = upper_indices(n)
+        values = np.ones(comparisons.shape[:-1] + (n, n))
+        values[..., iu, ju] = comparisons
+        # a 0 marks a missing judgment (incomplete matrices, see priority.llsm_weights)
+        values[..., ju, iu] = np.divide(1.0, comparisons, out=np.zeros_like(comparisons), where=comparisons != 0)
+        return cls(values)
+
+    @classmethod
+    def from_full(cls, matrix) -> "PairwiseMatrix":
+        """Only the upper triangle is read; the lower one is rebuilt as its reciprocal."""
+        matrix = np.asarray(matrix, dtype=float)
+        if matrix.ndim < 2 or matrix.shape[-1] != matrix.shape[-2]:
+            raise ValueError(f"Pairwise matrix must be square, got shape {matrix.shape}.")
+        n = matrix.shape[-1]
+        iu, ju = upper_indices(n)
+        return cls.from_upper(n, matrix[..., iu, ju])
+
+    @classmethod
+    def from_sparse(cls, n: int, comparisons: Iterable[Tuple[int, int, float]]) -> "PairwiseMatrix":
+        """(i, j, a_ij) triples in any order; (j, i, v) is read as a_ij = 1 / v."""
+        triples = np.asarray(list(comparisons), dtype=float).reshape(-1, 3)
+        i, j, v = triples[:, 0].astype(int), triples[:, 1].astype(int), triples[:, 2]
+        if np.any((i < 0) | (j < 0) | (i >= n) | (j >= n) | (i == j)):
+            raise ValueError(f"Comparison indices must be distinct and within 0..{n - 1}.")
+        flip = i > j
+        i[flip], j[flip], v[flip] = j[flip], i[flip], 1.0 / v[flip]
+        values = np.full((n, n), np.nan)
+        np.fill_diagonal(values, 1.0)
+        values[i, j] = v
+        values[j, i] = 1.0 / v
+        missing = int(np.isnan(values).sum()) // 2
+        if missing:
+            raise ValueError(f"{missing} of {n * (n - 1) // 2} comparisons are missing.")
+        return cls(values)
+
+    def upper(self) -> np.ndarray:
+        iu, ju = upper_indices(self.n)
+        return self.values[..., iu, ju]
+
+    def inverted(self) -> "PairwiseMatrix":
+        """Judgments read the other way round (cost criteria): the reciprocal transpose."""
+        return PairwiseMatrix(np.swapaxes(self.values, -1, -2))
@@ -0,0 +1,182 @@
+"""
+Aggregation methods besides the weighted sum, all fed by the AHP weights.
+
+Every method reads the (criteria, alternatives) alternative weights of the
+pipeline. Cost criteria are already inverted in them, so every criterion is
+maximised, and the criteria weights are those of the AHP solve:
+
+    wsm        weighted sum, the pipeline's own final_scores
+    topsis     closeness to the ideal alternative after vector normalisation,
+               d- / (d+ + d-)
+    vikor      group utility S, individual regret R, and Q = v S' + (1 - v) R'
+               (S', R' rescaled to [0, 1]). Lower Q is better; the score is 1 - Q.
+    promethee  PROMETHEE II net flow with a linear preference function per
+               criterion: P(d) = 0 up to the indifference threshold q, 1 from
+               the preference threshold p, linear in between. q and p are
+               fractions of the criterion's range.
+
+TOPSIS and VIKOR are a few array operations over (..., criteria, alternatives).
+The PROMETHEE flows are sums over all pairs of alternatives. With q = 0 and
+either p >= 1 (preference proportional to the difference) or p = 0 (the
+"usual" step criterion), the sums have a closed form over the sorted values:
+O(m log m) per criterion. Other thresholds go through blocks of rows of the
+(m, m, criteria) difference tensor, at most PROMETHEE_BLOCK entries at a time,
+so there is no Python loop over pairs.
+"""
+import numpy as np
+
+from .core import aggregate, rank
+from .group import kendall_w
+
+SCORING_METHODS = ("wsm", "topsis", "vikor", "promethee")
+# differences held in memory per PROMETHEE block
+PROMETHEE_BLOCK = 1 << 21
+DEFAULT_OPTIONS = {"vikor_v": 0.5, "promethee_q": 0.0, "promethee_p": 1.0}
+
+
+def scoring_methods(method: str) -> tuple:
+    """The methods a scoring_method selects; "all" selects every one."""
+    if method == "all":
+        return SCORING_METHODS
+    if method not in SCORING_METHODS:
+        raise ValueError(f"Unknown scoring method '{method}'. Use one of {SCORING_METHODS} or 'all'.")
+    return ("wsm", method) if method != "wsm" else ("wsm",)
+
+
+def _unit(x: np.ndarray) -> np.ndarray:
+    """Rescaled to [0, 1] along the last axis (0 where all values are equal)."""
+    lo, hi = x.min(axis=-1, keepdims=True), x.max(axis=-1, keepdims=True)
+    span = hi - lo
+    return np.where(span > 0, (x - lo) / np.where(span > 0, span, 1.0), 0.0)
+
+
+def topsis(crit_weights, alt_weights) -> np.ndarray:
+    """Relative closeness to the ideal solution, (..., alternatives)."""
+    cw, aw = np.asarray(crit_weights, dtype=float), np.asarray(alt_weights, dtype=float)
+    norm = np.linalg.norm(aw, axis=-1, keepdims=True)
+    v = cw[..., None] * aw / np.where(norm > 0, norm, 1.0)
+    d_plus = np.sqrt(np.sum((v - v.max(axis=-1, keepdims=True)) ** 2, axis=-2))
+    d_minus = np.sqrt(np.sum((v - v.min(axis=-1, keepdims=True)) ** 2, axis=-2))
+    total = d_plus + d_minus
+    return np.where(total > 0, d_minus / np.where(total > 0, total, 1.0), 0.5)
+
+
+def vikor(crit_weights, alt_weights, v: float = 0.5) -> dict:
+    """S (group utility), R (individual regret) and Q, each (..., alternatives); lower is better."""
+    cw, aw = np.asarray(crit_weights, dtype=float), np.asarray(alt_weights, dtype=float)
+    best, worst = aw.max(axis=-1, keepdims=True), aw.min(axis=-1, keepdims=True)
+    span = best - worst
+    regret = cw[..., None] * np.where(span > 0, (best - aw) / np.where(span > 0, span, 1.0), 0.0)
+    S, R = regret.sum(axis=-2), regret.max(axis=-2)
+    return {"S": S, "R": R, "Q": v * _unit(S) + (1 - v) * _unit(R)}
+
+
+def _sorted_flows(x: np.ndarray, p: float):
+    """
+    Per-criterion sums over b of P(a, b) and P(b, a) for q = 0 and p = 0 or
+    p >= 1, from one sort per criterion; x is (c, m).
+    """
+    c, m = x.shape
+    leaving, entering = np.empty((c, m)), np.empty((c, m))
+    for j in range(c):
+        xs = np.sort(x[j])
+        below = np.searchsorted(xs, x[j], side="left")         # b with x_b < x_a
+        above = m - np.searchsorted(xs, x[j], side="right")    # b with x_b > x_a
+        if p == 0:
+            leaving[j], entering[j] = below, above
+        else:
+            # no difference exceeds the range, so P(d) = d / (p * range) for every d > 0
+            span = p * (xs[-1] - xs[0])
+            prefix = np.concatenate(([0.0], np.cumsum(xs)))
+            up = below * x[j] - prefix[below]
+            down = (prefix[m] - prefix[m - above]) - above * x[j]
+            leaving[j], entering[j] = (up / span, down / span) if span > 0 else (0.0, 0.0)
+    return leaving, entering
+
+
+def _blocked_flows(x: np.ndarray, cw: np.ndarray, lo: np.ndarray, width: np.ndarray, block: int):
+    """Weighted sums over b of pi(a, b) and pi(b, a), a block of rows a at a time; x is (c, m)."""
+    c, m = x.shape
+    xt = x.T
+    rows = max(1, block // max(1, m * c))
+    leaving, entering = np.empty(m), np.zeros(m)
+    linear = width > 0
+    scale = 1.0 / np.where(linear, width, 1.0)
+    for start in range(0, m, rows):
+        d = xt[start:start + rows, None, :] - xt[None, :, :]
+        if linear.all():
+            d -= lo
+            d *= scale
+            pref = np.clip(d, 0.0, 1.0, out=d)
+        else:
+            pref = np.where(linear, np.clip((d - lo) * scale, 0.0, 1.0), d > lo)
+        pi = pref @ cw
+        leaving[start:start + rows] = pi.sum(axis=1)
+        entering += pi.sum(axis=0)
+    return leaving, entering
+
+
+def promethee(crit_weights, alt_weights, q: float = 0.0, p: float = 1.0, block: int = PROMETHEE_BLOCK) -> dict:
+    """PROMETHEE positive, negative and net flows, each (..., alternatives)."""
+    cw, aw = np.asarray(crit_weights, dtype=float), np.asarray(alt_weights, dtype=float)
+    if not 0 <= q <= p:
+        raise ValueError("PROMETHEE thresholds need 0 <= promethee_q <= promethee_p.")
+    if aw.ndim > 2:
+        flows = [promethee(w, a, q, p, block) for w, a in zip(cw.reshape(-1, cw.shape[-1]),
+                                                               aw.reshape(-1, *aw.shape[-2:]))]
+        return {k: np.stack([f[k] for f in flows]).reshape(aw.shape[:-2] + aw.shape[-1:]) for k in flows[0]}
+    m = aw.shape[-1]
+    if m < 2:
+        return {k: np.zeros(m) for k in ("positive", "negative", "net")}
+    if q == 0 and (p >= 1 or p == 0):
+        leaving, entering = _sorted_flows(aw, p)
+        leaving, entering = cw @ leaving, cw @ entering
+    else:
+        span = aw.max(axis=-1) - aw.min(axis=-1)
+        lo = q * span
+        leaving, entering = _blocked_flows(aw, cw, lo, p * span - lo, block)
+    positive, negative = leaving / (m - 1), entering / (m - 1)
+    return {"positive": positive, "negative": negative, "net": positive - negative}
+
+
+def method_scores(method: str, crit_weights, alt_weights, options: dict = None, wsm=None) -> dict:
+    """
+    {method: {"scores": (..., alternatives), extra arrays}} for every method
+    that `method` selects; higher scores are better for all of them. wsm
+    passes in weighted-sum scores the caller already has.
+    """
+    opts = {**DEFAULT_OPTIONS, **{k: v for k, v in (options or {}).items() if v is not None}}
+    if not 0 <= opts["vikor_v"] <= 1:
+        raise ValueError("vikor_v must be between 0 and 1.")
+    out = {}
+    for name in scoring_methods(method):
+        if name == "wsm":
+            out[name] = {"scores": aggregate(crit_weights, alt_weights) if wsm is None else np.asarray(wsm)}
+        elif name == "topsis":
+            out[name] = {"scores": topsis(crit_weights, alt_weights)}
+        elif name == "vikor":
+            res = vikor(crit_weights, alt_weights, opts["vikor_v"])
+            out[name] = {"scores": 1.0 - res["Q"], **res}
+        else:
+            res = promethee(crit_weights, alt_weights, opts["promethee_q"], opts["promethee_p"])
+            out[name] = {"scores": res["net"], **res}
+    return out
+
+
+def method_report(method: str, results: dict, alternatives, index=()) -> dict:
+    """
+    The response fields of one problem (index into the leading axes): the
+    selected method's final_scores / ranking / best and every computed method
+    side by side, with Kendall's W of their rankings.
+    """
+    primary = "wsm" if method == "all" else method
+    methods = {}
+    for name, arrays in results.items():
+        scores = arrays["scores"][index]
+        ranking = rank(scores)
+        methods[name] = {**{k: v[index].tolist() for k, v in arrays.items()},
+                         "ranking": ranking.tolist(), "best": alternatives[int(ranking[0])]}
+    stacked = np.stack([results[name]["scores"][index] for name in results])
+    return {"scoring_method": method, "final_scores": methods[primary]["scores"],
+            "ranking": methods[primary]["ranking"], "best": methods[primary]["best"], "methods": methods,
+            "method_agreement": kendall_w(stacked)}
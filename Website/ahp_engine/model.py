@@ -0,0 +1,131 @@
+"""
+Frozen scoring models: criteria solved once, new alternatives scored on demand.
+
+A ScoringModel stores the criteria weights and consistency, each column's
+transformation (see screening.py) and, when reference alternatives are given
+at registration, their column statistics. Scoring a batch of new alternatives
+is then the linear form
+
+    score = t @ (w / divisor) + const
+
+which is O(criteria) per alternative. No pairwise matrix is re-solved, and
+subjective criteria are not supported. The sum-based normalisations need a
+divisor per column, and `normalization` chooses where it comes from:
+
+    frozen  the reference alternatives' statistics. Scores do not depend on
+            the rest of the batch, so they can be compared across calls.
+    batch   the incoming batch alone (what /api/calculate would compute for it)
+    pooled  reference and incoming alternatives together
+"""
+import numpy as np
+
+from .core import calculate_weights, rank
+from .pipeline import consistent, criteria_weights
+from .screening import ColumnStats, TopK, column_kinds, transform
+
+NORMALIZATIONS = ("frozen", "batch", "pooled")
+
+
+class ScoringModel:
+    def __init__(self, criteria, crit_weights, crit_cr=None, crit_gci=None, risk_factors=None, reference=None,
+                 priority_method: str = "eigenvector", decision: str = ""):
+        self.criteria = list(criteria)
+        self.kinds = column_kinds(self.criteria)
+        self.weights = np.asarray(crit_weights, dtype=float)
+        self.crit_cr, self.crit_gci = crit_cr, crit_gci
+        self.risk_factors = np.zeros(len(self.criteria)) if risk_factors is None else \
+            np.asarray(risk_factors, dtype=float)
+        if self.risk_factors.shape != (len(self.criteria),):
+            raise ValueError(f"Expected {len(self.criteria)} risk factors, got {self.risk_factors.size}.")
+        self.reference = reference
+        # set when the reference was risk-penalised; new rows then have to be as well
+        self.needs_variances = False
+        self.priority_method = priority_method
+        self.decision = decision
+
+    @classmethod
+    def from_problem(cls, problem: dict, solve=calculate_weights) -> "ScoringModel":
+        """
+        Solve the criteria of a dict in the AHPRequest layout once; optional
+        reference_values / reference_variances ((alternatives, criteria)
+        matrices) fix the normalisation constants.
+        """
+        crit_weights, cr, gci, _ = criteria_weights(problem, solve)
+        model = cls(problem["criteria"], crit_weights, cr, gci, problem.get("risk_factors"),
+                    priority_method=problem.get("priority_method", "eigenvector"),
+                    decision=problem.get("decision", ""))
+        if problem.get("reference_values") is not None:
+            model.reference = model.column_stats(problem["reference_values"], problem.get("reference_variances"))
+            model.needs_variances = problem.get("reference_variances") is not None and \
+                bool(np.any(model.risk_factors[model.kinds == "uncertain"]))
+        return model
+
+    def _transformed(self, values, variances=None) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2 or values.shape[1] != len(self.criteria) or values.shape[0] == 0:
+            raise ValueError(f"values must be an (alternatives, {len(self.criteria)}) matrix, got shape {values.shape}.")
+        if variances is not None:
+            variances = np.asarray(variances, dtype=float)
+            if variances.shape != values.shape:
+                raise ValueError(f"variances must have the shape of values {values.shape}, got {variances.shape}.")
+        return transform(values, self.kinds, variances, self.risk_factors)
+
+    def column_stats(self, values, variances=None) -> ColumnStats:
+        stats = ColumnStats(len(self.criteria))
+        stats.update(self._transformed(values, variances))
+        return stats
+
+    def normalizers(self, t: np.ndarray, normalization: str):
+        if normalization not in NORMALIZATIONS:
+            raise ValueError(f"Unknown normalization '{normalization}'. Use one of {NORMALIZATIONS}.")
+        if normalization != "batch" and self.reference is None:
+            raise ValueError(f"'{normalization}' normalization needs reference alternatives at registration.")
+        if normalization == "frozen":
+            return self.reference.normalizers(self.kinds)
+        stats = ColumnStats(len(self.criteria))
+        stats.update(t)
+        if normalization == "pooled":
+            stats.count += self.reference.count
+            stats.total += self.reference.total
+            stats.minimum = np.minimum(stats.minimum, self.reference.minimum)
+        return stats.normalizers(self.kinds)
+
+    def score(self, values, variances=None, normalization: str = None, top_k: int = None) -> dict:
+        """
+        Scores, best-first ranking and per-criterion contributions of an
+        (alternatives, criteria) batch. normalization defaults to "frozen"
+        with reference alternatives and to "batch" without them. top_k limits
+        the ranking and contributions to the best rows. Variances are required
+        when the reference alternatives were risk-penalised.
+        """
+        normalization = normalization or ("batch" if self.reference is None else "frozen")
+        if variances is None and self.needs_variances:
+            raise ValueError("This model was registered with reference_variances and non-zero risk factors; "
+                             "send variances for the new alternatives so the risk penalty applies to them too.")
+        t = self._transformed(values, variances)
+        offset, divisor = self.normalizers(t, normalization)
+        coef = self.weights / divisor
+        scores = t @ coef + float(coef @ offset)
+        if top_k is None:
+            ranking = rank(scores)
+        else:
+            if top_k < 1:
+                raise ValueError("top_k must be at least 1.")
+            top = TopK(min(top_k, scores.size))
+            top.update(scores)
+            ranking = top.result()[0]
+        return {"normalization": normalization, "final_scores": scores.tolist(), "ranking": ranking.tolist(),
+                "contributions": ((t[ranking] + offset) * coef).tolist()}
+
+    def describe(self) -> dict:
+        ref = self.reference
+        out = {"decision": self.decision, "priority_method": self.priority_method,
+               "criteria": [c["name"] for c in self.criteria], "criteria_weights": self.weights.tolist(),
+               "criteria_cr": self.crit_cr,
+               "criteria_consistent": consistent(len(self.criteria), self.crit_cr, self.crit_gci),
+               "criteria_gci": self.crit_gci, "risk_factors": self.risk_factors.tolist(),
+               "reference_count": None if ref is None else ref.count}
+        if ref is not None:
+            offset, divisor = ref.normalizers(self.kinds)
+            out["normalizers"] = {"offset": offset.tolist(), "divisor": divisor.tolist()}
+        return out
@@ -0,0 +1,199 @@
+"""
+The single-problem evaluation pipeline behind /api/calculate.
+
+A problem is a plain dict in the AHPRequest layout (decision, criteria,
+alternatives, criteria_comparisons, alt_data, uncertain_data, eigen_method,
+priority_method, simulation, and optionally criteria_triples / alt_triples
+for sparse judgments, a criteria_tree of sub-criteria, or a scoring_method
+other than the weighted sum), so the web app passes req.model_dump() and scripts can pass
+parsed JSON directly. Bad input raises ValueError.
+"""
+import numpy as np
+
+from .core import (CONSISTENCY_THRESHOLD, as_list, build_matrix, calculate_weights, consistency_ratio,
+                   normalize_objective, normalize_shift, rank, risk_adjusted)
+from .hierarchy import hierarchy_weights
+from .matrix import PairwiseMatrix
+from .mcdm import method_report, method_scores
+from .priority import LOG_METHODS, gci_threshold, geometric_consistency_index
+from .sensitivity import perturbation_scores, stability_intervals
+from .sparse import prioritize_triples
+from .simulation import simulate
+
+
+def consistent(n: int, cr, gci) -> bool:
+    """CR <= 0.1, or the GCI threshold where no CR is available (large sparse problems)."""
+    return cr <= CONSISTENCY_THRESHOLD if cr is not None else gci <= gci_threshold(n)
+
+
+def alternative_weights(problem: dict, solve=calculate_weights):
+    """
+    Per-criterion alternative weights, as a (criteria, alternatives) array, plus
+    the subjective consistency ratios (and GCIs for log methods) and the
+    uncertain-mode details.
+    """
+    n_alt = len(problem["alternatives"])
+    method = problem.get("eigen_method", "auto")
+    priority = problem.get("priority_method", "eigenvector")
+    uncertain_data = problem.get("uncertain_data")
+    alt_triples = problem.get("alt_triples") or []
+
+    alt_weights = np.empty((len(problem["criteria"]), n_alt))
+    alt_crs = []
+    alt_gcis = []
+    uncertain_details = []
+
+    for i, criterion in enumerate(problem["criteria"]):
+        cr, gci, details = None, None, None
+
+        if criterion["mode"] == "objective":
+            alt_weights[i] = normalize_objective(problem["alt_data"][i], criterion["type"])
+
+        elif criterion["mode"] == "subjective" and i < len(alt_triples) and alt_triples[i] is not None:
+            alt_weights[i], cr, gci = prioritize_triples(n_alt, alt_triples[i], priority, criterion["type"] == "cost")
+
+        elif criterion["mode"] == "subjective":
+            matrix = PairwiseMatrix.from_upper(n_alt, problem["alt_data"][i])
+            if criterion["type"] == "cost":
+                matrix = matrix.inverted()
+            alt_weights[i], lmax = solve(matrix.values, method, priority)
+            cr = float(consistency_ratio(n_alt, lmax))
+            if priority in LOG_METHODS:
+                gci = geometric_consistency_index(matrix.values, alt_weights[i])
+
+        else:  # uncertain
+            ud = uncertain_data[i] if uncertain_data else None
+            if ud is None:
+                alt_weights[i] = 1.0 / n_alt
+            else:
+                adjusted = risk_adjusted(ud["means"], ud["variances"], ud["risk_factor"])
+                alt_weights[i] = normalize_shift(adjusted)
+                details = {"means": as_list(ud["means"]), "variances": as_list(ud["variances"]),
+                           "risk_factor": ud["risk_factor"], "adjusted": adjusted.tolist()}
+
+        alt_crs.append(cr)
+        alt_gcis.append(gci)
+        uncertain_details.append(details)
+
+    return alt_weights, alt_crs, alt_gcis, uncertain_details
+
+
+def criteria_weights(problem: dict, solve=calculate_weights):
+    """
+    Criteria weights, CR, GCI (log methods and sparse input, else None) and the
+    hierarchy report (None unless criteria_tree is given).
+    """
+    criteria = problem["criteria"]
+    n_criteria = len(criteria)
+    priority = problem.get("priority_method", "eigenvector")
+    if problem.get("criteria_tree") is not None:
+        # global leaf weights; the worst node CR stands for the whole tree
+        weights, hierarchy = hierarchy_weights(problem["criteria_tree"], criteria,
+                                               problem.get("eigen_method", "auto"), priority, solve)
+        return weights, hierarchy["max_cr"], None, hierarchy
+    if problem.get("criteria_triples") is not None:
+        return (*prioritize_triples(n_criteria, problem["criteria_triples"], priority), None)
+    matrix = build_matrix(n_criteria, problem["criteria_comparisons"])
+    weights, lmax = solve(matrix, problem.get("eigen_method", "auto"), priority)
+    weights = np.asarray(weights, dtype=float)
+    gci = geometric_consistency_index(matrix, weights) if priority in LOG_METHODS else None
+    return weights, float(consistency_ratio(n_criteria, lmax)), gci, None
+
+
+def iter_stages(problem: dict, solve=calculate_weights):
+    """
+    The pipeline as (stage, data) pairs, cheapest first: weights, scores,
+    one sensitivity row per criterion, stability, simulation.
+
+    solve(matrix, eigen_method, priority_method) -> (weights, lambda_max) can be
+    swapped for a cached solver.
+    """
+    criteria, alternatives = problem["criteria"], problem["alternatives"]
+    n_criteria = len(criteria)
+    priority = problem.get("priority_method", "eigenvector")
+
+    crit_weights, crit_cr, crit_gci, hierarchy = criteria_weights(problem, solve)
+    alt_weights, alt_crs, alt_gcis, uncertain_details = alternative_weights(problem, solve)
+
+    weights = {
+        "decision": problem["decision"], "priority_method": priority,
+        "criteria_weights": crit_weights.tolist(), "criteria_cr": crit_cr,
+        "criteria_consistent": consistent(n_criteria, crit_cr, crit_gci), "criteria_gci": crit_gci,
+        "alt_weights_list": alt_weights.tolist(), "alt_crs": alt_crs, "alt_gcis": alt_gcis,
+        "uncertain_details": uncertain_details
+    }
+    if hierarchy is not None:
+        weights["criteria_hierarchy"] = hierarchy
+    yield "weights", weights
+
+    contributions = crit_weights[:, None] * alt_weights
+    final_scores = contributions.sum(axis=0)
+    ranking = rank(final_scores).tolist()
+    scores = {
+        "final_scores": final_scores.tolist(), "ranking": ranking,
+        "best": alternatives[ranking[0]],
+        "detailed_scores": {c["name"]: row for c, row in zip(criteria, contributions.tolist())}
+    }
+    method = problem.get("scoring_method", "wsm")
+    if method != "wsm":
+        # detailed_scores, sensitivity and stability keep analysing the weighted sum
+        results = method_scores(method, crit_weights, alt_weights, problem.get("scoring"), final_scores)
+        scores.update(method_report(method, results, alternatives))
+    yield "scores", scores
+
+    original_best = alternatives[int(np.argmax(final_scores))]
+    for c, ns in zip(criteria, perturbation_scores(crit_weights, alt_weights)):
+        nb = alternatives[int(np.argmax(ns))]
+        yield "sensitivity", {"criterion": c["name"], "original_best": original_best,
+                              "new_best": nb, "stable": nb == original_best, "new_scores": ns.tolist()}
+
+    yield "stability", stability_report(criteria, alternatives, crit_weights, alt_weights)
+    if problem.get("simulation") is not None:
+        yield "simulation", simulation_report(problem)
+
+
+def assemble_stages(stages) -> dict:
+    """Fold (stage, data) pairs back into the flat /api/calculate response."""
+    result = {"sensitivity": []}
+    for stage, data in stages:
+        if stage == "sensitivity":
+            result["sensitivity"].append(data)
+        elif stage in ("stability", "simulation"):
+            result[stage] = data
+        else:
+            result.update(data)
+    return result
+
+
+def evaluate(problem: dict, solve=calculate_weights) -> dict:
+    """Run the whole pipeline and return the /api/calculate response."""
+    return assemble_stages(iter_stages(problem, solve))
+
+
+def stability_report(criteria, alternatives, cw: np.ndarray, aw: np.ndarray) -> dict:
+    st = stability_intervals(cw, aw, full_ranking=True)
+    name = lambda idx: alternatives[idx] if idx >= 0 else None
+    rows = [{"criterion": c["name"], "weight": w, "lower": lo, "upper": hi,
+             "lower_challenger": name(lb), "upper_challenger": name(ub),
+             "ranking_lower": rlo, "ranking_upper": rhi}
+            for c, w, lo, hi, lb, ub, rlo, rhi in zip(
+                criteria, st["weight"].tolist(), st["lower"].tolist(), st["upper"].tolist(),
+                st["lower_by"].tolist(), st["upper_by"].tolist(), st["rank_lower"].tolist(), st["rank_upper"].tolist())]
+    crossover = np.where(np.isnan(st["crossover"]), None, st["crossover"]).tolist()
+    return {"best": alternatives[st["best"]], "criteria": rows, "crossover_weights": crossover}
+
+
+def simulation_report(problem: dict) -> dict:
+    cfg = problem["simulation"]
+    if problem.get("criteria_triples") is not None or any(t is not None for t in problem.get("alt_triples") or []):
+        raise ValueError("Simulation needs complete comparisons; it does not support criteria_triples / alt_triples.")
+    if problem.get("criteria_tree") is not None:
+        raise ValueError("Simulation perturbs the flat criteria comparisons; it does not support criteria_tree.")
+    sim = simulate(len(problem["alternatives"]), problem["criteria_comparisons"], problem["criteria"],
+                   problem["alt_data"], problem.get("uncertain_data"), n_draws=cfg.get("n_draws", 10000),
+                   seed=cfg.get("seed"), chunk_size=cfg.get("chunk_size", 20000),
+                   judgment_spread=cfg.get("judgment_spread", 0.0), eigen_method=problem.get("eigen_method", "auto"),
+                   priority_method=problem.get("priority_method", "eigenvector"))
+    return {"n_draws": sim["n_draws"], "seed": cfg.get("seed"), "judgment_spread": cfg.get("judgment_spread", 0.0),
+            **{k: sim[k].tolist() for k in ("win_probability", "rank_acceptability", "expected_rank",
+                                            "score_mean", "score_std")}}
@@ -0,0 +1,119 @@
+"""
+Prioritization methods: how a weight vector is derived from a pairwise matrix.
+
+    eigenvector     principal right eigenvector (Saaty); the solver is picked by eigen_method
+    geometric_mean  row geometric mean, the logarithmic least squares (LLSM) solution
+                    for complete matrices; O(n^2), no eigendecomposition
+    additive        normalise every column to sum 1, then average the rows
+    llsm            logarithmic least squares that also accepts incomplete matrices
+                    (missing judgments entered as 0); needs a connected comparison graph
+
+Every method takes (n, n) or (B, n, n) input and returns (weights, lambda_max).
+For the non-eigenvector methods lambda_max is the mean of (A w)_i / w_i, which
+equals the principal eigenvalue when w is the eigenvector, so the usual CI/CR
+formulas apply unchanged. The geometric consistency index (GCI) is the
+consistency measure that belongs to the LLSM weights.
+"""
+import numpy as np
+
+from .eigen import geometric_mean_weights, principal_eigen
+
+PRIORITY_METHODS = ("eigenvector", "geometric_mean", "additive", "llsm")
+# methods whose weights minimise log errors, so GCI is reported with them
+LOG_METHODS = ("geometric_mean", "llsm")
+
+# Aguarón & Moreno-Jiménez (2003) thresholds, comparable to CR <= 0.1
+GCI_THRESHOLDS = {3: 0.31, 4: 0.35}
+GCI_THRESHOLD = 0.37
+
+
+def gci_threshold(n: int) -> float:
+    return GCI_THRESHOLDS.get(n, GCI_THRESHOLD)
+
+
+def _present(matrices: np.ndarray) -> np.ndarray:
+    return np.isfinite(matrices) & (matrices > 0)
+
+
+def require_complete(matrices: np.ndarray, method: str):
+    """Every method but llsm needs all judgments present and positive."""
+    if method != "llsm" and not _present(matrices).all():
+        raise ValueError("Missing or non-positive comparisons are only supported by the 'llsm' priority method.")
+
+
+def completed(matrices: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Missing entries replaced by the ratios w_i / w_j the weights imply."""
+    ratios = weights[..., :, None] / weights[..., None, :]
+    return np.where(_present(matrices), matrices, ratios)
+
+
+def lambda_from_weights(matrices: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    aw = np.einsum("...ij,...j->...i", matrices, weights)
+    return np.mean(aw / weights, axis=-1)
+
+
+def additive_weights(matrices: np.ndarray) -> np.ndarray:
+    columns = matrices / np.sum(matrices, axis=-2, keepdims=True)
+    return np.mean(columns, axis=-1)
+
+
+def llsm_weights(matrices: np.ndarray) -> np.ndarray:
+    """
+    Logarithmic least squares over the judgments that are present. With
+    y = log w this is the graph-Laplacian system L y = r, r_i = sum_j log a_ij,
+    which has a unique solution (up to scale) iff the comparisons connect all items.
+    """
+    present = _present(matrices)
+    if present.all():
+        return geometric_mean_weights(matrices)
+    n = matrices.shape[-1]
+    off = present & ~np.eye(n, dtype=bool)
+    logs = np.where(off, np.log(np.where(present, matrices, 1.0)), 0.0)
+    laplacian = np.eye(n) * off.sum(axis=-1)[..., None] - off
+    # adding the all-ones matrix pins sum(y) = 0 and makes the system regular
+    system = laplacian + 1.0 / n
+    if np.any(np.abs(np.linalg.det(system)) < 1e-9):
+        raise ValueError("Incomplete comparisons must connect every item to every other (directly or through others).")
+    y = np.linalg.solve(system, logs.sum(axis=-1)[..., None])[..., 0]
+    w = np.exp(y)
+    return w / np.sum(w, axis=-1, keepdims=True)
+
+
+def geometric_consistency_index(matrices: np.ndarray, weights: np.ndarray):
+    """
+    GCI = sum over compared pairs i<j of log^2(a_ij w_j / w_i), divided by the
+    degrees of freedom (pairs - (n - 1)); for complete matrices this is the usual
+    2 / ((n - 1)(n - 2)) normalisation. 0 for n < 3.
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    n = matrices.shape[-1]
+    if n < 3:
+        return np.zeros(matrices.shape[:-2]) if matrices.ndim > 2 else 0.0
+    iu, ju = np.triu_indices(n, k=1)
+    a = matrices[..., iu, ju]
+    present = _present(a)
+    err = np.log(np.where(present, a, 1.0) * weights[..., ju] / weights[..., iu])
+    dof = np.maximum(present.sum(axis=-1) - (n - 1), 1)
+    gci = np.sum(np.where(present, err ** 2, 0.0), axis=-1) / dof
+    return float(gci) if np.ndim(gci) == 0 else gci
+
+
+def prioritize(matrices: np.ndarray, method: str = "eigenvector", eigen_method: str = "auto"):
+    """Weights and lambda_max of one matrix (n, n) or a stack (B, n, n)."""
+    if method not in PRIORITY_METHODS:
+        raise ValueError(f"Unknown priority method '{method}'. Use one of {PRIORITY_METHODS}.")
+    matrices = np.asarray(matrices, dtype=float)
+    require_complete(matrices, method)
+
+    if method == "eigenvector":
+        return principal_eigen(matrices, eigen_method)
+    if method == "geometric_mean":
+        weights = geometric_mean_weights(matrices)
+    elif method == "additive":
+        weights = additive_weights(matrices)
+    else:
+        weights = llsm_weights(matrices)
+    lambda_max = lambda_from_weights(completed(matrices, weights), weights)
+    if matrices.ndim == 2:
+        return weights, float(lambda_max)
+    return weights, lambda_max
@@ -0,0 +1,131 @@
+"""
+Random Index (RI) values for the consistency ratio CR = CI / RI(n).
+
+Saaty's published table covers n <= 10. Beyond that RI(n) is estimated as
+the mean consistency index of random reciprocal matrices whose upper
+triangle is drawn uniformly from the Saaty scale {1/9, ..., 1/2, 1, 2, ..., 9}.
+The simulation is seeded per n, so every process computes the same value.
+Results are memoised in-process and in a JSON file shared by all workers
+(AHP_RI_CACHE, default <tmpdir>/ahp_engine_random_index.json); an unwritable
+cache location is ignored.
+
+The values for n = 11..50 are precomputed (SIMULATED_RI). A cold simulation
+costs seconds for a few dozen items and grows roughly with n^3, so beyond the
+table random_index() only simulates up to AHP_RI_MAX_N items (default 50) and
+raises ValueError above that unless the value is cached already.
+warm_random_index() fills the cache ahead of time, e.g. at server start.
+"""
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from .eigen import principal_eigen
+from .matrix import PairwiseMatrix
+
+PUBLISHED_RI = {
+    1: 0.00, 2: 0.00, 3: 0.58, 4: 0.90, 5: 1.12,
+    6: 1.24, 7: 1.32, 8: 1.41, 9: 1.45, 10: 1.49
+}
+
+# simulate_random_index(n) for n = 11..50 (MC_SAMPLES draws, seed n), shipped so that
+# no request or worker start pays for the simulation up to MAX_SIMULATED_N
+SIMULATED_RI = {
+    11: 1.5127, 12: 1.5353, 13: 1.5560, 14: 1.5718, 15: 1.5846, 16: 1.5948, 17: 1.6067, 18: 1.6150,
+    19: 1.6226, 20: 1.6290, 21: 1.6349, 22: 1.6399, 23: 1.6461, 24: 1.6511, 25: 1.6555, 26: 1.6595,
+    27: 1.6628, 28: 1.6660, 29: 1.6697, 30: 1.6723, 31: 1.6752, 32: 1.6780, 33: 1.6807, 34: 1.6826,
+    35: 1.6848, 36: 1.6870, 37: 1.6886, 38: 1.6905, 39: 1.6923, 40: 1.6935, 41: 1.6952, 42: 1.6964,
+    43: 1.6984, 44: 1.6993, 45: 1.7007, 46: 1.7019, 47: 1.7026, 48: 1.7042, 49: 1.7052, 50: 1.7056
+}
+
+SAATY_SCALE = np.array([1/9, 1/8, 1/7, 1/6, 1/5, 1/4, 1/3, 1/2, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+
+MC_SAMPLES = 20000
+MC_CHUNK = 2000
+# matrix entries per stacked chunk (8 MB of float64), so memory does not grow with n
+MC_ELEMENTS = 1 << 20
+MAX_SIMULATED_N = int(os.environ.get("AHP_RI_MAX_N", 50))
+
+_memo = {}
+_lock = threading.Lock()
+
+
+def cache_path() -> Path:
+    return Path(os.environ.get("AHP_RI_CACHE", Path(tempfile.gettempdir()) / "ahp_engine_random_index.json"))
+
+
+def _read_cache() -> dict:
+    try:
+        with open(cache_path()) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("samples") != MC_SAMPLES:
+        return {}
+    return {int(k): float(v) for k, v in data.get("values", {}).items()}
+
+
+def _write_cache(values: dict):
+    path = cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        merged = {**_read_cache(), **values}
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"samples": MC_SAMPLES, "values": {str(k): v for k, v in sorted(merged.items())}}, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def simulate_random_index(n: int, samples: int = MC_SAMPLES, chunk: int = None, seed: int = None) -> float:
+    """
+    Mean CI of `samples` random Saaty-scale reciprocal n x n matrices, solved in
+    stacked chunks of at most MC_CHUNK matrices and MC_ELEMENTS entries
+    (unless chunk is given).
+    """
+    rng = np.random.default_rng(n if seed is None else seed)
+    k = n * (n - 1) // 2
+    chunk = chunk or max(1, min(MC_CHUNK, MC_ELEMENTS // (n * n)))
+    total = 0.0
+    for start in range(0, samples, chunk):
+        size = min(chunk, samples - start)
+        matrices = PairwiseMatrix.from_upper(n, rng.choice(SAATY_SCALE, size=(size, k))).values
+        _, lambda_max = principal_eigen(matrices, "power")
+        total += float(np.sum(lambda_max))
+    return (total / samples - n) / (n - 1)
+
+
+def random_index(n: int) -> float:
+    if n in PUBLISHED_RI:
+        return PUBLISHED_RI[n]
+    if n in SIMULATED_RI:
+        return SIMULATED_RI[n]
+    if n in _memo:
+        return _memo[n]
+    with _lock:
+        if n not in _memo:
+            _memo.update(_read_cache())
+        if n not in _memo:
+            if n > MAX_SIMULATED_N:
+                raise ValueError(f"The consistency ratio of {n} items needs a random index that is only simulated "
+                                 f"up to {MAX_SIMULATED_N} items; raise AHP_RI_MAX_N or warm the cache first.")
+            _memo[n] = round(simulate_random_index(n), 4)
+            _write_cache({n: _memo[n]})
+    return _memo[n]
+
+
+def warm_random_index(sizes) -> dict:
+    """Simulate and cache RI for every n in sizes that is not known yet, whatever MAX_SIMULATED_N is."""
+    with _lock:
+        _memo.update(_read_cache())
+        todo = [n for n in sizes if n not in PUBLISHED_RI and n not in SIMULATED_RI and n not in _memo]
+    for n in todo:
+        value = round(simulate_random_index(n), 4)
+        with _lock:
+            _memo[n] = value
+            _write_cache({n: value})
+    return {n: random_index(n) for n in sizes}
@@ -0,0 +1,141 @@
+"""
+Which judgments make a pairwise matrix inconsistent, and what to change them to.
+
+With weights w, the error matrix e_ij = a_ij * w_j / w_i is all ones for a
+perfectly consistent matrix; |log e_ij| measures how far judgment (i, j)
+disagrees with the ratio w_i / w_j implied by all the others. The most
+deviating judgments are the candidates. Each is replaced by its implied ratio
+(rounded to the Saaty scale), and the modified matrices are re-solved as one
+(K, n, n) stack to get the CR each single change would give.
+
+The repair plan is an iterative error-matrix repair: each step takes the most
+deviating judgment and tries its rounded and its exact implied ratio (one
+stacked solve of two matrices), keeping whichever lowers CR. A judgment that
+lowers CR by neither is skipped until some other change has been made. Steps
+repeat until CR <= threshold, no judgment lowers CR any more, or max_changes
+judgments have been changed; in the latter two cases `repaired_consistent` is
+false. Uniformly random matrices at n = 50 need about half of their judgments
+changed, in roughly 0.2 s.
+"""
+import numpy as np
+
+from .core import CONSISTENCY_THRESHOLD, consistency_ratio
+from .matrix import upper_indices
+from .priority import prioritize
+from .random_index import SAATY_SCALE
+
+LOG_SCALE = np.log(SAATY_SCALE)
+
+
+def judgment_errors(matrices: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """e_ij = a_ij * w_j / w_i for one matrix or a stack; 1 everywhere means consistent."""
+    return matrices * weights[..., None, :] / weights[..., :, None]
+
+
+def to_scale(values: np.ndarray) -> np.ndarray:
+    """Nearest Saaty-scale value (1/9 ... 9), measured on the log scale."""
+    logs = np.log(values)
+    return SAATY_SCALE[np.argmin(np.abs(logs[..., None] - LOG_SCALE), axis=-1)]
+
+
+def _candidates(matrix, weights, top, scale):
+    """Upper-triangle positions of the `top` most deviating judgments and their proposed values."""
+    iu, ju = upper_indices(matrix.shape[-1])
+    deviation = np.abs(np.log(judgment_errors(matrix, weights)[iu, ju]))
+    order = np.argsort(-deviation, kind="stable")[:top]
+    order = order[deviation[order] > 0]
+    implied = weights[iu[order]] / weights[ju[order]]
+    proposed = implied
+    if scale:
+        rounded = to_scale(implied)
+        # judgments already at the nearest scale value fall back to the exact ratio
+        proposed = np.where(rounded == matrix[iu[order], ju[order]], implied, rounded)
+    return order, implied, proposed, deviation[order]
+
+
+def _what_if(matrix, order, proposed, eigen_method, priority_method):
+    """CR (and weights) with each candidate judgment changed on its own, solved as one stack."""
+    n = matrix.shape[-1]
+    iu, ju = upper_indices(n)
+    k = np.arange(order.size)
+    stack = np.repeat(matrix[None], order.size, axis=0)
+    stack[k, iu[order], ju[order]] = proposed
+    stack[k, ju[order], iu[order]] = 1.0 / proposed
+    weights, lmax = prioritize(stack, priority_method, eigen_method)
+    return consistency_ratio(n, lmax), weights
+
+
+def repair_suggestions(matrix, eigen_method: str = "auto", priority_method: str = "eigenvector",
+                       threshold: float = CONSISTENCY_THRESHOLD, top: int = 5, max_changes: int = None,
+                       scale: bool = True) -> dict:
+    """
+    Rank the judgments of a complete (n, n) matrix by their share in the
+    inconsistency and plan changes that bring CR to threshold or below.
+    `index` in the output is the judgment's position in the comparison list;
+    max_changes defaults to all n(n-1)/2 judgments.
+    """
+    matrix = np.array(matrix, dtype=float)
+    n = matrix.shape[-1]
+    if matrix.ndim != 2 or matrix.shape[0] != n:
+        raise ValueError(f"Pairwise matrix must be square, got shape {matrix.shape}.")
+    if not (np.isfinite(matrix).all() and (matrix > 0).all()):
+        raise ValueError("Repair suggestions need a complete matrix with positive judgments.")
+    iu, ju = upper_indices(n)
+    weights, lmax = prioritize(matrix, priority_method, eigen_method)
+    cr = float(consistency_ratio(n, lmax))
+    top = max(1, min(top, iu.size)) if n > 2 else 0
+
+    judgments = []
+    if top:
+        order, implied, proposed, deviation = _candidates(matrix, weights, top, scale)
+        if order.size:
+            cr_if, _ = _what_if(matrix, order, proposed, eigen_method, priority_method)
+            judgments = [{"i": int(iu[p]), "j": int(ju[p]), "index": int(p), "value": float(matrix[iu[p], ju[p]]),
+                          "implied": imp, "deviation": dev, "suggested": sug, "cr_if_changed": c}
+                         for p, imp, dev, sug, c in zip(order, implied.tolist(), deviation.tolist(),
+                                                         proposed.tolist(), cr_if.tolist())]
+
+    repairs, changes = [], {}
+    current, current_w, current_cr = matrix, weights, cr
+    limit = iu.size if max_changes is None else max_changes
+    skip = np.zeros(iu.size, dtype=bool)
+    # a judgment can be revisited, so steps are capped rather than candidates
+    for _ in range(2 * iu.size if n > 2 else 0):
+        if current_cr <= threshold:
+            break
+        deviation = np.abs(np.log(judgment_errors(current, current_w)[iu, ju]))
+        deviation[skip] = -1.0
+        p = int(np.argmax(deviation))
+        if deviation[p] <= 0:
+            break
+        skip[p] = True
+        if p not in changes and len(changes) >= limit:
+            continue
+        i, j = int(iu[p]), int(ju[p])
+        implied = current_w[i] / current_w[j]
+        values = np.array([to_scale(implied) if scale else implied, implied])
+        cr_if, w_if = _what_if(current, np.array([p, p]), values, eigen_method, priority_method)
+        best = 0 if cr_if[0] < current_cr else 1
+        if cr_if[best] >= current_cr:
+            continue
+        value = float(values[best])
+        if p in changes:
+            # a revisited judgment moves to its latest step, keeping its original value
+            repairs.remove(changes[p])
+        else:
+            changes[p] = {"i": i, "j": j, "index": p, "from": float(current[i, j])}
+        changes[p].update({"to": value, "cr": float(cr_if[best])})
+        repairs.append(changes[p])
+        current = current.copy()
+        current[i, j], current[j, i] = value, 1.0 / value
+        current_w, current_cr = w_if[best], float(cr_if[best])
+        skip[:] = False
+        skip[p] = True
+
+    return {
+        "consistency_ratio": cr, "consistent": cr <= threshold, "threshold": threshold,
+        "judgments": judgments, "repairs": repairs,
+        "repaired_cr": current_cr, "repaired_consistent": current_cr <= threshold,
+        "repaired_weights": np.asarray(current_w).tolist(),
+        "repaired_comparisons": current[iu, ju].tolist(),
+    }
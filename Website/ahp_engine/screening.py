@@ -0,0 +1,229 @@
+"""
+Columnar scoring of very many alternatives on objective and uncertain criteria.
+
+Alternatives arrive as one dense (alternatives, criteria) matrix instead of
+per-criterion lists. For uncertain criteria the column holds the means, and an
+optional matrix of the same shape holds the variances. The normalisations of
+the flat pipeline (normalize_objective, normalize_shift) divide each column by
+its sum, so the weighted sum is linear in the transformed values t:
+
+    t    = x (benefit), 1 / x (cost), mean - risk_factor * variance (uncertain)
+    score = sum_j w_j (t_j + offset_j) / divisor_j  =  t @ coef + const
+
+with offset = 0 except for uncertain columns that go non-positive (the shift
+of normalize_shift) and divisor = sum(t + offset). That needs only the count,
+sum and minimum of every transformed column, collected block by block. Scoring
+is then one matrix-vector product per block of rows. The k best rows are kept
+in a running top-k (argpartition per block, no full sort), and the score
+summary is merged block by block as well, so memory stays at one block of rows
+whatever the number of alternatives. Only the top rows (with their
+per-criterion contributions) and the summary are returned.
+
+The matrix can be any array-like, including a read-only np.memmap of a .npy or
+raw binary file (open_matrix), so files larger than RAM are streamed twice
+from disk: once for the column statistics, once for scoring. Subjective
+criteria need pairwise matrices over the alternatives and are not supported
+here.
+"""
+from pathlib import Path
+
+import numpy as np
+
+from .core import calculate_weights
+from .pipeline import consistent, criteria_weights
+
+CHUNK_ROWS = 65536
+SCREEN_MODES = ("objective", "uncertain")
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+# quantiles are exact up to this many rows and taken from an evenly strided sample beyond it
+QUANTILE_SAMPLE = 1_000_000
+SHIFT = 0.0001   # as in normalize_shift
+
+
+def column_kinds(criteria) -> np.ndarray:
+    """"benefit", "cost" or "uncertain" per criterion."""
+    bad = [c["name"] for c in criteria if c["mode"] not in SCREEN_MODES]
+    if bad:
+        raise ValueError(f"Columnar scoring supports objective and uncertain criteria only, not {bad}.")
+    return np.array(["uncertain" if c["mode"] == "uncertain" else "benefit" if c["type"] == "benefit" else "cost"
+                     for c in criteria])
+
+
+def transform(block: np.ndarray, kinds: np.ndarray, variances: np.ndarray = None, risk_factors=None) -> np.ndarray:
+    """Rows of raw values as the quantities that get normalised (a copy only when a column changes)."""
+    cost, uncertain = kinds == "cost", kinds == "uncertain"
+    has_risk = variances is not None and uncertain.any()
+    if not cost.any() and not has_risk:
+        return np.asarray(block, dtype=float)
+    out = np.array(block, dtype=float)
+    if cost.any():
+        out[:, cost] = 1.0 / out[:, cost]
+    if has_risk:
+        out[:, uncertain] -= np.asarray(risk_factors, dtype=float)[uncertain] * variances[:, uncertain]
+    return out
+
+
+def row_blocks(values: np.ndarray, variances: np.ndarray = None, chunk_rows: int = CHUNK_ROWS):
+    """(start, value rows, variance rows or None) in blocks of chunk_rows."""
+    for start in range(0, values.shape[0], chunk_rows):
+        stop = start + chunk_rows
+        yield start, values[start:stop], None if variances is None else variances[start:stop]
+
+
+class ColumnStats:
+    """Running count, sum and minimum of the transformed columns."""
+
+    def __init__(self, n_columns: int):
+        self.count = 0
+        self.total = np.zeros(n_columns)
+        self.minimum = np.full(n_columns, np.inf)
+
+    def update(self, t: np.ndarray):
+        self.count += t.shape[0]
+        self.total += t.sum(axis=0)
+        self.minimum = np.minimum(self.minimum, t.min(axis=0, initial=np.inf))
+
+    def normalizers(self, kinds: np.ndarray):
+        """(offset, divisor) per column, matching normalize_objective / normalize_shift on the whole column."""
+        offset = np.where((kinds == "uncertain") & (self.minimum <= 0), SHIFT - self.minimum, 0.0)
+        divisor = self.total + self.count * offset
+        if not np.all(np.isfinite(divisor)) or np.any(divisor == 0):
+            raise ValueError("Every column must have finite values with a non-zero sum (and no zero cost values).")
+        return offset, divisor
+
+
+class TopK:
+    """The k largest scores seen so far, merged block by block with argpartition."""
+
+    def __init__(self, k: int):
+        self.k = k
+        self.indices = np.empty(0, dtype=np.int64)
+        self.scores = np.empty(0)
+
+    def update(self, scores: np.ndarray, start: int = 0):
+        if scores.size > self.k:
+            part = np.argpartition(-scores, self.k - 1)[:self.k]
+        else:
+            part = np.arange(scores.size)
+        indices = np.concatenate([self.indices, part + start])
+        merged = np.concatenate([self.scores, scores[part]])
+        if merged.size > self.k:
+            keep = np.argpartition(-merged, self.k - 1)[:self.k]
+            indices, merged = indices[keep], merged[keep]
+        self.indices, self.scores = indices, merged
+
+    def result(self):
+        """(indices, scores), best first; ties go to the lower index."""
+        order = np.lexsort((self.indices, -self.scores))
+        return self.indices[order], self.scores[order]
+
+
+class ScoreSummary:
+    """Count, mean, std (Chan et al. merge), min, max and quantiles of scores seen block by block."""
+
+    def __init__(self, total_rows: int, sample: int = QUANTILE_SAMPLE):
+        self.stride = max(1, -(-total_rows // sample))
+        self.count, self.mean, self.m2 = 0, 0.0, 0.0
+        self.min, self.max = np.inf, -np.inf
+        self.samples = []
+
+    def update(self, scores: np.ndarray, start: int = 0):
+        n = scores.size
+        mean = float(scores.mean())
+        delta = mean - self.mean
+        total = self.count + n
+        self.m2 += float(((scores - mean) ** 2).sum()) + delta ** 2 * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+        self.min, self.max = min(self.min, float(scores.min())), max(self.max, float(scores.max()))
+        self.samples.append(scores[(-start) % self.stride::self.stride])
+
+    def result(self) -> dict:
+        sample = np.concatenate(self.samples)
+        return {"count": self.count, "mean": self.mean, "std": (self.m2 / self.count) ** 0.5,
+                "min": self.min, "max": self.max, "quantiles_exact": self.stride == 1,
+                "quantiles": {f"p{round(q * 100)}": float(v)
+                              for q, v in zip(SUMMARY_QUANTILES, np.quantile(sample, SUMMARY_QUANTILES))}}
+
+
+def open_matrix(path, n_columns: int = None, dtype: str = "<f8", offset: int = 0) -> np.ndarray:
+    """
+    Read-only memory map of an (alternatives, criteria) matrix: a .npy file
+    (shape and dtype from its header) or raw C-order values of `dtype` starting
+    at byte `offset`, n_columns per row.
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        values = np.load(path, mmap_mode="r")
+    else:
+        if n_columns is None:
+            raise ValueError("Raw matrices need the number of columns.")
+        values = np.memmap(path, dtype=np.dtype(dtype), mode="r", offset=offset)
+        if values.size % n_columns:
+            raise ValueError(f"{path} holds {values.size} values, not a multiple of {n_columns} columns.")
+        values = values.reshape(-1, n_columns)
+    if values.dtype.kind not in "biuf":
+        raise ValueError(f"Matrices must be numeric, got dtype {values.dtype}.")
+    return values
+
+
+def screen(values, criteria, crit_weights, variances=None, risk_factors=None, top_k: int = 10,
+           chunk_rows: int = CHUNK_ROWS) -> dict:
+    """
+    Scores of an (alternatives, criteria) matrix under the flat pipeline's
+    normalisations and weighted sum; returns the top_k rows (indices, scores,
+    per-criterion contributions) and a summary of all scores.
+    """
+    # arrays (memmaps included) are read a block at a time, never converted as a whole
+    values = values if isinstance(values, np.ndarray) else np.asarray(values, dtype=float)
+    kinds = column_kinds(criteria)
+    if values.ndim != 2 or values.shape[1] != len(criteria) or values.shape[0] == 0:
+        raise ValueError(f"values must be an (alternatives, {len(criteria)}) matrix, got shape {values.shape}.")
+    if variances is not None:
+        variances = variances if isinstance(variances, np.ndarray) else np.asarray(variances, dtype=float)
+        if variances.shape != values.shape:
+            raise ValueError(f"variances must have the shape of values {values.shape}, got {variances.shape}.")
+    if risk_factors is None:
+        risk_factors = np.zeros(len(criteria))
+    elif len(risk_factors) != len(criteria):
+        raise ValueError(f"Expected {len(criteria)} risk factors, got {len(risk_factors)}.")
+    if top_k < 1:
+        raise ValueError("top_k must be at least 1.")
+
+    stats = ColumnStats(len(criteria))
+    for _, block, var in row_blocks(values, variances, chunk_rows):
+        stats.update(transform(block, kinds, var, risk_factors))
+    offset, divisor = stats.normalizers(kinds)
+    coef = np.asarray(crit_weights, dtype=float) / divisor
+    const = float(coef @ offset)
+
+    top, summary = TopK(min(top_k, values.shape[0])), ScoreSummary(values.shape[0])
+    for start, block, var in row_blocks(values, variances, chunk_rows):
+        scores = transform(block, kinds, var, risk_factors) @ coef + const
+        top.update(scores, start)
+        summary.update(scores, start)
+    indices, best = top.result()
+    t = transform(values[indices], kinds, None if variances is None else variances[indices], risk_factors)
+    return {"top_indices": indices.tolist(), "top_scores": best.tolist(),
+            "top_contributions": ((t + offset) * coef).tolist(), "summary": summary.result()}
+
+
+def screen_problem(problem: dict, solve=calculate_weights) -> dict:
+    """
+    screen() on a dict with the criteria fields of the AHPRequest layout plus
+    values, variances, risk_factors, top_k and optional alternative names.
+    """
+    crit_weights, cr, gci, hierarchy = criteria_weights(problem, solve)
+    result = screen(problem["values"], problem["criteria"], crit_weights, problem.get("variances"),
+                    problem.get("risk_factors"), problem.get("top_k", 10), problem.get("chunk_rows", CHUNK_ROWS))
+    names = problem.get("alternatives")
+    if names:
+        if len(names) != len(problem["values"]):
+            raise ValueError(f"Got {len(names)} alternative names for {len(problem['values'])} rows.")
+        result["top_alternatives"] = [names[k] for k in result["top_indices"]]
+    report = {"decision": problem.get("decision", ""), "priority_method": problem.get("priority_method", "eigenvector"),
+              "criteria_weights": crit_weights.tolist(), "criteria_cr": cr,
+              "criteria_consistent": consistent(len(problem["criteria"]), cr, gci), "criteria_gci": gci, **result}
+    if hierarchy is not None:
+        report["criteria_hierarchy"] = hierarchy
+    return report
@@ -0,0 +1,101 @@
+"""
+Weight sensitivity of the weighted-sum aggregation.
+
+When one criterion weight w_k is moved to t and the others are rescaled
+proportionally (so the weights still sum to 1), every alternative's score
+is linear in t:
+
+    S_a(t) = alpha_ka + beta_ka * t,   alpha_ka = (S_a - w_k v_ka) / (1 - w_k),
+                                       beta_ka  = v_ka - alpha_ka
+
+so the range of t over which one alternative stays ahead of another is a
+closed-form interval. All criteria and alternatives are handled in one
+vectorised pass.
+"""
+import numpy as np
+
+
+def _linear_scores(crit_weights: np.ndarray, alt_weights: np.ndarray):
+    w = crit_weights[:, None]
+    scores = crit_weights @ alt_weights
+    with np.errstate(divide="ignore", invalid="ignore"):
+        alpha = (scores[None, :] - w * alt_weights) / (1.0 - w)
+    return alpha, alt_weights - alpha
+
+
+def _pair_intervals(alpha, beta, leader, follower):
+    """
+    For every criterion k, the interval of t on which alternative `leader`
+    scores at least as high as `follower` (both index arrays, broadcast over k),
+    plus the crossover weight itself.
+    """
+    rows = np.arange(alpha.shape[0])[:, None]
+    p = alpha[rows, leader] - alpha[rows, follower]
+    q = beta[rows, leader] - beta[rows, follower]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cross = np.where(q != 0, -p / q, np.nan)
+    lower = np.where(q > 0, cross, -np.inf)
+    upper = np.where(q < 0, cross, np.inf)
+    return lower, upper, cross
+
+
+def perturbation_scores(crit_weights, alt_weights, factor: float = 1.10) -> np.ndarray:
+    """
+    Scores after scaling each criterion weight by `factor` in turn: shape
+    (criteria, alternatives), or (B, criteria, alternatives) for stacked inputs.
+    """
+    crit_weights = np.asarray(crit_weights, dtype=float)
+    c = crit_weights.shape[-1]
+    bumped = np.repeat(crit_weights[..., None, :], c, axis=-2)
+    bumped[..., np.arange(c), np.arange(c)] *= factor
+    bumped /= bumped.sum(axis=-1, keepdims=True)
+    return bumped @ np.asarray(alt_weights, dtype=float)
+
+
+def stability_intervals(crit_weights, alt_weights, full_ranking: bool = False) -> dict:
+    """
+    Exact weight intervals over which the top alternative (or, with
+    full_ranking, the whole ranking) is unchanged.
+
+    Returns arrays indexed by criterion:
+        weight, lower, upper      current weight and the stability interval within [0, 1]
+        lower_by, upper_by        alternative that overtakes the leader at each bound (-1 if none)
+        crossover                 (criteria, alternatives) weight at which each alternative
+                                  ties with the leader (NaN if never, or for the leader itself)
+    and, with full_ranking, rank_lower / rank_upper for the complete order.
+    """
+    crit_weights = np.asarray(crit_weights, dtype=float)
+    alt_weights = np.asarray(alt_weights, dtype=float)
+    n_criteria, n_alt = alt_weights.shape
+    alpha, beta = _linear_scores(crit_weights, alt_weights)
+    scores = crit_weights @ alt_weights
+    best = int(np.argmax(scores))
+
+    others = np.arange(n_alt)
+    lower, upper, cross = _pair_intervals(alpha, beta, np.full(n_alt, best), others)
+    cross[:, best] = np.nan
+    lower[:, best], upper[:, best] = -np.inf, np.inf
+
+    lower_by = np.where(np.isfinite(lower).any(axis=1), np.argmax(lower, axis=1), -1)
+    upper_by = np.where(np.isfinite(upper).any(axis=1), np.argmin(upper, axis=1), -1)
+    result = {
+        "best": best,
+        "weight": crit_weights,
+        # (+ 0.0 turns a clipped -0.0 into 0.0)
+        "lower": np.clip(lower.max(axis=1), 0.0, 1.0) + 0.0,
+        "upper": np.clip(upper.min(axis=1), 0.0, 1.0) + 0.0,
+        "lower_by": np.where(lower.max(axis=1) > 0, lower_by, -1),
+        "upper_by": np.where(upper.min(axis=1) < 1, upper_by, -1),
+        "crossover": np.where((cross >= 0) & (cross <= 1), cross, np.nan),
+    }
+    if n_criteria == 1:
+        # a lone criterion always carries the full weight
+        result["lower"][:] = result["upper"][:] = 1.0
+        result["lower_by"][:] = result["upper_by"][:] = -1
+
+    if full_ranking:
+        ranking = np.argsort(scores)[::-1]
+        lo, hi, _ = _pair_intervals(alpha, beta, ranking[:-1], ranking[1:])
+        result["rank_lower"] = np.clip(np.max(lo, axis=1, initial=-np.inf), 0.0, 1.0) + 0.0
+        result["rank_upper"] = np.clip(np.min(hi, axis=1, initial=np.inf), 0.0, 1.0) + 0.0
+    return result
@@ -0,0 +1,183 @@
+"""
+Incremental re-evaluation of one decision while its inputs are edited.
+
+A DecisionSession keeps the solved state of a problem: the pairwise matrices,
+criteria weights, the (criteria, alternatives) alternative-weight matrix and
+the final scores. A delta touches a single input, so only the affected
+matrix is re-solved, warm-started from its previous eigenvector:
+
+  * an alternative-level change (one judgment, value, mean, variance or risk
+    factor of criterion k) changes row k only, and final scores get the
+    rank-1 correction  cw[k] * (new_row - old_row);
+  * a criteria judgment changes the criteria weights, and final scores are
+    one (alternatives x criteria) matrix-vector product.
+
+The problem dict is kept in step with every delta, so pipeline.evaluate on
+session.problem always reproduces the session's numbers.
+"""
+import copy
+
+import numpy as np
+
+from .core import consistency_ratio, normalize_objective, normalize_shift, rank, risk_adjusted
+from .eigen import principal_eigen
+from .matrix import PairwiseMatrix
+from .mcdm import method_report, method_scores, scoring_methods
+from .priority import prioritize, require_complete
+
+UNCERTAIN_FIELDS = ("mean", "variance", "risk_factor")
+
+
+def _upper_position(n: int, i: int, j: int) -> int:
+    """Index of (i, j), i < j, in the row-major upper-triangle comparison list."""
+    return i * n - i * (i + 1) // 2 + (j - i - 1)
+
+
+class DecisionSession:
+    def __init__(self, problem: dict, solved: dict = None):
+        """
+        solved is the pipeline's "weights" stage for the same problem (see
+        pipeline.iter_stages); its weights and CRs are taken over instead of
+        solving every matrix a second time.
+        """
+        if problem.get("criteria_triples") is not None or any(t is not None for t in problem.get("alt_triples") or []):
+            raise ValueError("Sessions need complete comparisons; criteria_triples / alt_triples are not supported.")
+        if problem.get("criteria_tree") is not None:
+            raise ValueError("Sessions edit flat criteria comparisons; criteria_tree is not supported.")
+        self.problem = copy.deepcopy(problem)
+        self.eigen_method = problem.get("eigen_method", "auto")
+        self.priority = problem.get("priority_method", "eigenvector")
+        scoring_methods(problem.get("scoring_method", "wsm"))   # unknown methods fail here, not on the first update
+        criteria = self.problem["criteria"]
+        self.n_criteria, self.n_alt = len(criteria), len(self.problem["alternatives"])
+
+        self.crit_matrix = PairwiseMatrix.from_upper(self.n_criteria, self.problem["criteria_comparisons"]).values
+        self.alt_matrices = {}
+        if solved is None:
+            self.crit_weights, self.crit_cr = self._solve(self.crit_matrix)
+            self.alt_crs = [None] * self.n_criteria
+            self.alt_weights = np.empty((self.n_criteria, self.n_alt))
+            for k in range(self.n_criteria):
+                self.alt_weights[k] = self._alternative_row(k)
+        else:
+            self.crit_weights, self.crit_cr = np.array(solved["criteria_weights"], dtype=float), solved["criteria_cr"]
+            self.alt_crs = list(solved["alt_crs"])
+            self.alt_weights = np.array(solved["alt_weights_list"], dtype=float)
+            for k, criterion in enumerate(criteria):
+                if criterion["mode"] == "subjective":
+                    self._alternative_matrix(k)
+        self.final_scores = self.crit_weights @ self.alt_weights
+
+    def _solve(self, matrix: np.ndarray, x0: np.ndarray = None):
+        if self.priority == "eigenvector":
+            require_complete(matrix, self.priority)
+            weights, lmax = principal_eigen(matrix, self.eigen_method, x0=x0)
+        else:
+            weights, lmax = prioritize(matrix, self.priority)
+        return weights, float(consistency_ratio(matrix.shape[-1], lmax))
+
+    def _alternative_row(self, k: int) -> np.ndarray:
+        """Alternative weights of criterion k, solved from scratch (warm-started for subjective rows)."""
+        criterion = self.problem["criteria"][k]
+        data = self.problem["alt_data"][k]
+        if criterion["mode"] == "objective":
+            return normalize_objective(data, criterion["type"])
+        if criterion["mode"] == "subjective":
+            # the first solve starts cold, later ones from the previous weights
+            x0 = self.alt_weights[k] if k in self.alt_matrices else None
+            weights, self.alt_crs[k] = self._solve(self._alternative_matrix(k), x0)
+            return weights
+        ud = (self.problem.get("uncertain_data") or [None] * self.n_criteria)[k]
+        if ud is None:
+            return np.full(self.n_alt, 1.0 / self.n_alt)
+        return normalize_shift(risk_adjusted(ud["means"], ud["variances"], ud["risk_factor"]))
+
+    def _alternative_matrix(self, k: int) -> np.ndarray:
+        """Pairwise matrix of subjective criterion k as it is solved (reciprocal transpose for cost criteria)."""
+        if k not in self.alt_matrices:
+            criterion = self.problem["criteria"][k]
+            matrix = PairwiseMatrix.from_upper(self.n_alt, self.problem["alt_data"][k])
+            self.alt_matrices[k] = (matrix.inverted() if criterion["type"] == "cost" else matrix).values.copy()
+        return self.alt_matrices[k]
+
+    def _set_judgment(self, matrix: np.ndarray, comparisons: list, n: int, i: int, j: int, value: float,
+                      transposed: bool = False):
+        if i is None or j is None or not (0 <= i < n and 0 <= j < n) or i == j:
+            raise ValueError(f"Comparison indices must be distinct and within 0..{n - 1}.")
+        if not value > 0:
+            raise ValueError("Comparison values must be positive.")
+        if i > j:
+            i, j, value = j, i, 1.0 / value
+        comparisons[_upper_position(n, i, j)] = value
+        if transposed:   # cost criteria solve the reciprocal transpose of what the user entered
+            i, j = j, i
+        matrix[i, j] = value
+        matrix[j, i] = 1.0 / value
+
+    def apply(self, delta: dict) -> dict:
+        """
+        Apply one change and return the updated numbers. delta has "value" and either
+          criterion=None, i, j                    -> criteria judgment (i, j)
+          criterion=k, i, j                       -> alternative judgment (i, j) of subjective criterion k
+          criterion=k, alternative=a              -> value of alternative a for objective criterion k
+          criterion=k, alternative=a, field=f     -> uncertain mean / variance of a (field "mean" / "variance")
+          criterion=k, field="risk_factor"        -> risk factor of uncertain criterion k
+        """
+        k, value = delta.get("criterion"), float(delta["value"])
+
+        if k is None:
+            self._set_judgment(self.crit_matrix, self.problem["criteria_comparisons"], self.n_criteria,
+                               delta["i"], delta["j"], value)
+            self.crit_weights, self.crit_cr = self._solve(self.crit_matrix, self.crit_weights)
+            self.final_scores = self.crit_weights @ self.alt_weights
+            return self.summary(changed="criteria")
+
+        if not 0 <= k < self.n_criteria:
+            raise ValueError(f"Criterion index must be within 0..{self.n_criteria - 1}.")
+        criterion = self.problem["criteria"][k]
+        if criterion["mode"] == "subjective":
+            self._set_judgment(self.alt_matrices[k], self.problem["alt_data"][k], self.n_alt, delta["i"], delta["j"],
+                               value, transposed=criterion["type"] == "cost")
+        else:
+            a = delta.get("alternative")
+            field = delta.get("field", "value")
+            if field != "risk_factor" and not (a is not None and 0 <= a < self.n_alt):
+                raise ValueError(f"Alternative index must be within 0..{self.n_alt - 1}.")
+            if criterion["mode"] == "objective":
+                if not value > 0:
+                    raise ValueError("Objective values must be positive.")
+                self.problem["alt_data"][k][a] = value
+            else:
+                ud = (self.problem.get("uncertain_data") or [None] * self.n_criteria)[k]
+                if ud is None or field not in UNCERTAIN_FIELDS:
+                    raise ValueError("Uncertain criteria with data take field 'mean', 'variance' or 'risk_factor'.")
+                if field == "risk_factor":
+                    ud["risk_factor"] = value
+                else:
+                    ud["means" if field == "mean" else "variances"][a] = value
+
+        new_row = self._alternative_row(k)
+        # rank-1 correction: only criterion k's column of the score sum moved
+        self.final_scores = self.final_scores + self.crit_weights[k] * (new_row - self.alt_weights[k])
+        self.alt_weights[k] = new_row
+        return self.summary(changed=k)
+
+    def summary(self, changed=None) -> dict:
+        """Scores, ranking and best under the problem's scoring_method, as /api/calculate reports them."""
+        ranking = rank(self.final_scores).tolist()
+        result = {
+            "final_scores": self.final_scores.tolist(), "ranking": ranking,
+            "best": self.problem["alternatives"][ranking[0]],
+            "criteria_weights": self.crit_weights.tolist(), "criteria_cr": self.crit_cr,
+        }
+        method = self.problem.get("scoring_method", "wsm")
+        if method != "wsm":
+            results = method_scores(method, self.crit_weights, self.alt_weights, self.problem.get("scoring"),
+                                    self.final_scores)
+            result.update(method_report(method, results, self.problem["alternatives"]))
+        if changed is not None:
+            result["changed"] = changed
+        if isinstance(changed, int):
+            result["alt_weights"] = self.alt_weights[changed].tolist()
+            result["alt_cr"] = self.alt_crs[changed]
+        return result
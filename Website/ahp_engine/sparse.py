@@ -0,0 +1,187 @@
+"""
+Incomplete pairwise comparisons given as sparse (i, j, a_ij) triples.
+
+The judgments form a comparison graph over the n items; weights exist only
+if that graph is connected. Both solvers work on the edge list and cost
+O(edges) per iteration, never building the n x n matrix:
+
+    llsm    logarithmic least squares: solve the graph-Laplacian system
+            L y = r, r_i = sum_j log a_ij, w = exp(y), by Jacobi-preconditioned
+            conjugate gradients
+    harker  Harker's method: principal eigenvector of the matrix with every
+            missing entry set to 0 and 1 added to the diagonal per missing
+            entry of the row, by power iteration warm-started from LLSM
+
+lambda_max is that of the matrix completed with the implied ratios w_i / w_j
+(for Harker it is exactly the modified matrix's eigenvalue), so CI and CR read
+as usual; GCI is averaged over the compared pairs only. A solver that runs
+out of iterations raises ValueError rather than return an unconverged iterate.
+"""
+import numpy as np
+
+from .core import consistency_ratio
+
+SPARSE_METHODS = ("llsm", "harker")
+
+# CR needs RI(n), simulated for n > 10; past this size that is too costly and GCI is the measure
+SPARSE_CR_MAX_N = 50
+
+
+class ComparisonGraph:
+    """Validated edge list with i < j and a_ij > 0, one entry per compared pair."""
+
+    def __init__(self, n: int, i: np.ndarray, j: np.ndarray, values: np.ndarray):
+        self.n, self.i, self.j, self.values = n, i, j, values
+        self.log_values = np.log(values)
+        self.degree = np.bincount(i, minlength=n) + np.bincount(j, minlength=n)
+
+    @classmethod
+    def from_triples(cls, n: int, triples) -> "ComparisonGraph":
+        """(i, j, a_ij) in any order; (j, i, v) is read as a_ij = 1 / v."""
+        triples = np.asarray(triples, dtype=float).reshape(-1, 3)
+        i, j, v = triples[:, 0].astype(int), triples[:, 1].astype(int), triples[:, 2]
+        if np.any((i < 0) | (j < 0) | (i >= n) | (j >= n) | (i == j)):
+            raise ValueError(f"Comparison indices must be distinct and within 0..{n - 1}.")
+        if np.any(~np.isfinite(v) | (v <= 0)):
+            raise ValueError("Comparison values must be positive numbers.")
+        flip = i > j
+        i[flip], j[flip], v[flip] = j[flip], i[flip], 1.0 / v[flip]
+        pair = i * n + j
+        if np.unique(pair).size != pair.size:
+            raise ValueError("Each pair of items may be compared only once.")
+        return cls(n, i, j, v)
+
+    @property
+    def edges(self) -> int:
+        return self.i.size
+
+    def components(self) -> np.ndarray:
+        """Connected-component label (smallest member index) of every item."""
+        labels = np.arange(self.n)
+        while True:
+            low = np.minimum(labels[self.i], labels[self.j])
+            new = labels.copy()
+            np.minimum.at(new, self.i, low)
+            np.minimum.at(new, self.j, low)
+            new = new[new]   # pointer jumping: follow labels to their own labels
+            if np.array_equal(new, labels):
+                return labels
+            labels = new
+
+    def check_connected(self):
+        labels = self.components()
+        roots = np.unique(labels)
+        if roots.size > 1:
+            groups = [np.flatnonzero(labels == r).tolist() for r in roots]
+            shown = "; ".join(str(g[:8])[:-1] + (", ...]" if len(g) > 8 else "]") for g in groups[:5])
+            raise ValueError(f"Comparisons split the {self.n} items into {roots.size} unconnected groups "
+                             f"({shown}); add a comparison linking each group to the others.")
+
+    def neighbour_sum(self, x: np.ndarray, forward: np.ndarray, backward: np.ndarray) -> np.ndarray:
+        """sum_j m_kj x_j for an edge-weighted operator with m_ij = forward, m_ji = backward."""
+        return (np.bincount(self.i, forward * x[self.j], minlength=self.n)
+                + np.bincount(self.j, backward * x[self.i], minlength=self.n))
+
+
+def llsm_log_weights(graph: ComparisonGraph, tol: float = 1e-12, max_iter: int = None) -> np.ndarray:
+    n = graph.n
+    r = np.bincount(graph.i, graph.log_values, minlength=n) - np.bincount(graph.j, graph.log_values, minlength=n)
+    ones = np.ones(graph.edges)
+    laplacian = lambda y: graph.degree * y - graph.neighbour_sum(y, ones, ones)
+    inv_deg = 1.0 / graph.degree
+
+    # conjugate gradients on the (semi-definite) Laplacian; r sums to 0, so the
+    # iterates stay in its range and the sum(y) = 0 solution is reached
+    y = np.zeros(n)
+    res = r.copy()
+    z = inv_deg * res
+    z -= z.mean()
+    p = z.copy()
+    rz = res @ z
+    stop = tol * max(np.linalg.norm(r), 1.0)
+    max_iter = max_iter or 10 * n
+    for _ in range(max_iter):
+        if np.linalg.norm(res) <= stop:
+            break
+        lp = laplacian(p)
+        alpha = rz / (p @ lp)
+        y += alpha * p
+        res -= alpha * lp
+        z = inv_deg * res
+        z -= z.mean()
+        rz, rz_old = res @ z, rz
+        p = z + (rz / rz_old) * p
+    if np.linalg.norm(res) > stop:
+        raise ValueError(f"LLSM weights did not converge in {max_iter} iterations.")
+    return y - y.mean()
+
+
+def _normalise(w):
+    return w / np.sum(w)
+
+
+def llsm_weights(graph: ComparisonGraph) -> np.ndarray:
+    return _normalise(np.exp(llsm_log_weights(graph)))
+
+
+def harker_weights(graph: ComparisonGraph, tol: float = 1e-12, max_iter: int = 10000) -> np.ndarray:
+    diag = 1.0 + (graph.n - 1 - graph.degree)
+    # the shift leaves the eigenvectors alone and shrinks the other eigenvalues
+    # relative to the dominant one, which is what power iteration converges on
+    shift = diag.min() - 1.0
+    x = llsm_weights(graph)
+    for _ in range(max_iter):
+        y = (diag - shift) * x + graph.neighbour_sum(x, graph.values, 1.0 / graph.values)
+        y /= np.sum(y)
+        if np.max(np.abs(y - x)) < tol:
+            return y
+        x = y
+    raise ValueError(f"Harker's method did not converge in {max_iter} iterations; "
+                     f"the geometric_mean / llsm priority methods solve these comparisons directly.")
+
+
+def lambda_max(graph: ComparisonGraph, weights: np.ndarray) -> float:
+    """Mean of (Aw)_i / w_i for A completed with w_i / w_j; missing entries contribute exactly w_i."""
+    aw = graph.neighbour_sum(weights, graph.values, 1.0 / graph.values)
+    return float(np.mean(1.0 + (graph.n - 1 - graph.degree) + aw / weights))
+
+
+def sparse_gci(graph: ComparisonGraph, weights: np.ndarray) -> float:
+    if graph.n < 3:
+        return 0.0
+    err = graph.log_values + np.log(weights[graph.j]) - np.log(weights[graph.i])
+    return float(np.sum(err ** 2) / max(graph.edges - (graph.n - 1), 1))
+
+
+def sparse_prioritize(n: int, triples, method: str = "llsm", inverted: bool = False):
+    """
+    (weights, lambda_max, gci) from (i, j, a_ij) triples. inverted reads every
+    judgment the other way round (cost criteria).
+    """
+    if method not in SPARSE_METHODS:
+        raise ValueError(f"Unknown sparse method '{method}'. Use one of {SPARSE_METHODS}.")
+    if n == 1:
+        return np.ones(1), 1.0, 0.0
+    graph = ComparisonGraph.from_triples(n, triples)
+    if inverted:
+        graph = ComparisonGraph(n, graph.i, graph.j, 1.0 / graph.values)
+    graph.check_connected()
+    weights = llsm_weights(graph) if method == "llsm" else harker_weights(graph)
+    return weights, lambda_max(graph, weights), sparse_gci(graph, weights)
+
+
+def prioritize_triples(n: int, triples, priority_method: str = "eigenvector", inverted: bool = False):
+    """
+    (weights, CR or None, GCI) for sparse judgments, with the priority method
+    mapped to its incomplete-matrix counterpart: eigenvector -> Harker, log methods -> LLSM.
+    """
+    if priority_method == "eigenvector":
+        method = "harker"
+    elif priority_method in ("geometric_mean", "llsm"):
+        method = "llsm"
+    else:
+        raise ValueError(f"Sparse comparisons support the eigenvector, geometric_mean and llsm priority methods, "
+                         f"not '{priority_method}'.")
+    weights, lmax, gci = sparse_prioritize(n, triples, method, inverted)
+    cr = float(consistency_ratio(n, lmax)) if n <= SPARSE_CR_MAX_N else None
+    return weights, cr, gci
@@ -0,0 +1,170 @@
+"""
+MessagePack request and response bodies for the numeric API endpoints.
+
+JSON stays the default. A request with Content-Type: application/msgpack is
+decoded here, and a response is packed when the Accept header asks for it.
+Numeric arrays travel as typed buffers, maps of the form
+
+    {"dtype": "<f8", "shape": [rows, cols], "data": <bin, C order>}
+
+that decode zero-copy into read-only NumPy arrays (np.frombuffer over the
+received bytes). Request arrays skip pydantic: the model is validated with
+each array replaced by an empty list, and restore_arrays() puts the arrays back
+into the dumped dict. In responses, the fields named in ARRAY_KEYS are sent
+as float64 buffers.
+
+msgpack is optional: install the `msgpack` package to enable it. Without it,
+MessagePack requests get 415 and responses fall back to JSON.
+"""
+from typing import Callable
+
+import numpy as np
+from fastapi import HTTPException, Request
+from fastapi.routing import APIRoute
+from starlette.responses import JSONResponse, Response
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MSGPACK = "application/msgpack"
+MSGPACK_TYPES = (MSGPACK, "application/x-msgpack", "application/vnd.msgpack")
+
+# float-array response fields that are sent as typed buffers
+ARRAY_KEYS = frozenset({"criteria_weights", "alt_weights_list", "final_scores", "new_scores", "adjusted",
+                        "win_probability", "rank_acceptability", "expected_rank", "score_mean", "score_std",
+                        "weights", "individual_weights", "weight_spread", "compatibility", "top_scores",
+                        "top_contributions", "contributions"})
+
+ARRAY_FIELDS = frozenset({"dtype", "shape", "data"})
+
+
+def _media_types(header: str) -> set:
+    return {part.split(";")[0].strip().lower() for part in header.split(",")}
+
+
+def is_msgpack(content_type: str) -> bool:
+    return bool(_media_types(content_type or "") & set(MSGPACK_TYPES))
+
+
+def accepts_msgpack(accept: str) -> bool:
+    return msgpack is not None and bool(_media_types(accept or "") & set(MSGPACK_TYPES))
+
+
+def encode_array(arr: np.ndarray) -> dict:
+    arr = np.ascontiguousarray(arr)
+    return {"dtype": arr.dtype.str, "shape": list(arr.shape), "data": arr.tobytes()}
+
+
+def decode_array(obj: dict) -> np.ndarray:
+    dtype = np.dtype(obj["dtype"])
+    if dtype.kind not in "biuf":
+        raise ValueError(f"Typed arrays must be numeric, got dtype {dtype}.")
+    return np.frombuffer(obj["data"], dtype=dtype).reshape(obj["shape"])
+
+
+def _default(obj):
+    if isinstance(obj, np.ndarray):
+        return encode_array(obj)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Cannot pack {type(obj).__name__}")
+
+
+def _object_hook(obj: dict):
+    return decode_array(obj) if obj.keys() == ARRAY_FIELDS else obj
+
+
+def packb(obj) -> bytes:
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+def unpackb(body: bytes):
+    return msgpack.unpackb(body, object_hook=_object_hook, raw=False)
+
+
+def extract_arrays(obj, path=()):
+    """(obj with every ndarray replaced by [], [(path, array), ...])."""
+    if isinstance(obj, np.ndarray):
+        return [], [(path, obj)]
+    found = []
+    if isinstance(obj, dict):
+        out = {}
+        for key, value in obj.items():
+            out[key], sub = extract_arrays(value, path + (key,))
+            found += sub
+        return out, found
+    if isinstance(obj, list):
+        out = []
+        for idx, value in enumerate(obj):
+            item, sub = extract_arrays(value, path + (idx,))
+            out.append(item)
+            found += sub
+        return out, found
+    return obj, found
+
+
+def restore_arrays(request: Request, data: dict) -> dict:
+    """
+    Put the request's typed arrays back into the model_dump() of its body (as float64).
+    Arrays under keys the model does not define were dropped by validation and are
+    skipped, like unknown JSON fields.
+    """
+    for path, arr in request.scope.get("binary_arrays", ()):
+        target = data
+        try:
+            for key in path[:-1]:
+                target = target[key]
+            target[path[-1]]
+        except (KeyError, IndexError, TypeError):
+            continue
+        target[path[-1]] = np.asarray(arr, dtype=float)
+    return data
+
+
+def _typed(obj):
+    if isinstance(obj, dict):
+        return {key: (np.asarray(value, dtype=float) if key in ARRAY_KEYS and isinstance(value, list)
+                      and value and None not in value else _typed(value))
+                for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_typed(value) for value in obj]
+    return obj
+
+
+def respond(request: Request, data, json_response: bool = False):
+    """
+    MessagePack if the client accepts it. Otherwise data is returned unchanged for
+    FastAPI to encode, or as a JSONResponse that skips jsonable_encoder when
+    data is plain lists/floats already.
+    """
+    if accepts_msgpack(request.headers.get("accept")):
+        return Response(packb(_typed(data)), media_type=MSGPACK)
+    return JSONResponse(data) if json_response else data
+
+
+class BinaryRoute(APIRoute):
+    """Route that also accepts MessagePack bodies; the endpoint calls restore_arrays() on its dumped model."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if is_msgpack(request.headers.get("content-type")):
+                if msgpack is None:
+                    raise HTTPException(status_code=415, detail="MessagePack support needs the msgpack package.")
+                body = await request.body()
+                try:
+                    obj, arrays = extract_arrays(unpackb(body))
+                except (ValueError, TypeError, KeyError, msgpack.UnpackException) as e:
+                    raise HTTPException(status_code=400, detail=f"Invalid MessagePack body: {e}")
+                # FastAPI then validates obj as if it had arrived as JSON
+                headers = [(k, v) for k, v in request.scope["headers"] if k != b"content-type"]
+                scope = {**request.scope, "headers": headers + [(b"content-type", b"application/json")],
+                         "binary_arrays": arrays}
+                request = Request(scope, request.receive)
+                request._body, request._json = body, obj
+            return await handler(request)
+
+        return route_handler
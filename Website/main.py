@@ -1,54 +1,98 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional, Tuple
 import numpy as np
 from pathlib import Path
+import os
+import json
+import copy
+import secrets
+import threading
+from contextlib import asynccontextmanager
+from static_assets import PrecompressedPage, PrecompressedStaticFiles
+from offload import Offloader, Overloaded, matrix_cost, problem_cost, tree_cost
+from binary_format import BinaryRoute, respond, restore_arrays
+from metrics import Metrics, MetricsMiddleware, StageTimer
+from ahp_engine import (CONSISTENCY_THRESHOLD, DecisionSession, LRUCache, ScoringModel, array_key, assemble_stages, build_matrix,
+                        canonical_hash, consistency_ratio, evaluate_batch, gci_threshold, geometric_consistency_index,
+                        group_prioritize, iter_stages, prioritize, repair_suggestions, screen_problem,
+                        SIMULATED_RI, solve_hierarchy, warm_random_index)
 
 BASE_DIR = Path(__file__).parent
-app = FastAPI(title="AHP Decision Companion")
-
-RI = {1:0.00,2:0.00,3:0.58,4:0.90,5:1.12,6:1.24,7:1.32,8:1.41,9:1.45,10:1.49}
-
-def calculate_weights(matrix: np.ndarray):
-    eigenvalues, eigenvectors = np.linalg.eig(matrix)
-    max_index = int(np.argmax(eigenvalues.real))
-    lambda_max = float(eigenvalues.real[max_index])
-    weights = eigenvectors[:, max_index].real
-    weights = weights / np.sum(weights)
-    return weights.tolist(), lambda_max
-
-def consistency_ratio(n: int, lambda_max: float) -> float:
-    if n < 3: return 0.0
-    CI = (lambda_max - n) / (n - 1)
-    return float(CI / RI[n])
-
-def build_matrix(n: int, comparisons: List[float]) -> np.ndarray:
-    matrix = np.ones((n, n))
-    idx = 0
-    for i in range(n):
-        for j in range(i + 1, n):
-            v = comparisons[idx]
-            matrix[i][j] = v
-            matrix[j][i] = 1.0 / v
-            idx += 1
-    return matrix
-
-def normalize_objective(values: List[float], criterion_type: str) -> List[float]:
-    arr = np.array(values, dtype=float)
-    if criterion_type == "benefit":
-        return (arr / np.sum(arr)).tolist()
-    else:
-        inv = 1.0 / arr
-        return (inv / np.sum(inv)).tolist()
-
-def normalize_shift(values: List[float]) -> List[float]:
-    arr = np.array(values, dtype=float)
-    min_val = np.min(arr)
-    if min_val <= 0:
-        arr = arr - min_val + 0.0001
-    return (arr / np.sum(arr)).tolist()
+
+# heavy solves run on a thread/process pool with a bounded queue (see offload.py)
+OFFLOAD = Offloader.from_env()
+# off unless AHP_METRICS / AHP_SERVER_TIMING are set (see metrics.py)
+METRICS = Metrics.from_env()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # RI up to n = 50 ships precomputed; larger sizes up to AHP_RI_WARM_N are simulated in the
+    # background, not by the first request that needs one
+    sizes = range(max(SIMULATED_RI) + 1, int(os.environ.get("AHP_RI_WARM_N", 0)) + 1)
+    if sizes:
+        threading.Thread(target=warm_random_index, args=(sizes,), daemon=True).start()
+    yield
+    OFFLOAD.shutdown()
+
+app = FastAPI(title="AHP Decision Companion", lifespan=lifespan)
+# numeric endpoints that also take / return MessagePack (see binary_format.py)
+binary = APIRouter(route_class=BinaryRoute)
+if METRICS.timing:
+    app.add_middleware(MetricsMiddleware, metrics=METRICS)
+
+# whole /api/calculate responses (the UI re-posts identical bodies) and single matrix solves
+RESULT_CACHE = LRUCache(maxsize=int(os.environ.get("AHP_RESULT_CACHE_SIZE", 1024)),
+                        ttl=float(os.environ.get("AHP_RESULT_CACHE_TTL", 300)))
+WEIGHTS_CACHE = LRUCache(maxsize=int(os.environ.get("AHP_WEIGHTS_CACHE_SIZE", 4096)))
+# open editing sessions, per worker process; the TTL restarts on every update
+SESSIONS = LRUCache(maxsize=int(os.environ.get("AHP_SESSION_CACHE_SIZE", 256)),
+                    ttl=float(os.environ.get("AHP_SESSION_TTL", 1800)))
+# registered scoring models, per worker process; the TTL restarts on every use
+MODELS = LRUCache(maxsize=int(os.environ.get("AHP_MODEL_CACHE_SIZE", 256)),
+                  ttl=float(os.environ.get("AHP_MODEL_TTL", 86400)))
+
+def calculate_weights(matrix: np.ndarray, method: str = "auto", priority_method: str = "eigenvector"):
+    def solve():
+        weights, lambda_max = prioritize(matrix, priority_method, method)
+        weights.setflags(write=False)   # shared between requests through the cache
+        return weights, lambda_max
+    timer = METRICS.current()
+    if timer is None:
+        return WEIGHTS_CACHE.get_or_compute(array_key(matrix, method, priority_method), solve)
+    METRICS.observe_size("matrix", matrix.shape[-1])
+    with timer.time("solve"):
+        return WEIGHTS_CACHE.get_or_compute(array_key(matrix, method, priority_method), solve)
+
+def service_gauges():
+    """Cache, offload and session state for /metrics, read at scrape time."""
+    out = []
+    for name, cache in (("results", RESULT_CACHE), ("weights", WEIGHTS_CACHE), ("sessions", SESSIONS),
+                        ("models", MODELS)):
+        st = cache.stats()
+        out += [("ahp_cache_hits_total", "Cache hits.", "counter", {"cache": name}, st["hits"]),
+                ("ahp_cache_misses_total", "Cache misses.", "counter", {"cache": name}, st["misses"]),
+                ("ahp_cache_hit_ratio", "Hits / lookups since start.", "gauge", {"cache": name}, st["hit_rate"]),
+                ("ahp_cache_entries", "Entries currently cached.", "gauge", {"cache": name}, st["size"])]
+    st = OFFLOAD.stats()
+    out.append(("ahp_offload_in_flight", "Heavy jobs queued or running.", "gauge", {}, st["in_flight"]))
+    out += [("ahp_offload_jobs_total", "Solves by where they ran (rejected = 429).", "counter", {"route": route},
+             st[route]) for route in ("inline", "thread", "process", "rejected")]
+    return out
+
+METRICS.add_gauges(service_gauges)
+
+def timed_response(request: Request, data, timer: StageTimer = None):
+    """JSON (or MessagePack) response; with a timer, serialization is timed and Server-Timing added."""
+    if timer is None:
+        return respond(request, data, json_response=True)
+    with timer.time("serialize"):
+        response = respond(request, data, json_response=True)
+    METRICS.record_stages(timer)
+    if METRICS.server_timing:
+        response.headers["Server-Timing"] = timer.header()
+    return response
 
 class Criterion(BaseModel):
     name: str
@@ -59,102 +103,417 @@ class UncertainData(BaseModel):
     means: List[float]
     variances: List[float]
     risk_factor: float
+    distribution: str = "normal"                # simulation only: "normal", "lognormal", "triangular", "empirical"
+    samples: Optional[List[List[float]]] = None # per-alternative observations for "empirical"
+
+class SimulationConfig(BaseModel):
+    n_draws: int = Field(10000, gt=0)
+    seed: Optional[int] = None
+    chunk_size: int = Field(20000, gt=0)
+    judgment_spread: float = 0.0   # pairwise judgments are scaled by exp(U(-spread, spread)) per draw
+
+class CriteriaNode(BaseModel):
+    name: str
+    comparisons: List[float] = []           # upper triangle over the children
+    children: List["CriteriaNode"] = []     # none = a leaf criterion, matched to `criteria` by name
+
+class ScoringConfig(BaseModel):
+    vikor_v: float = 0.5       # weight of group utility against individual regret
+    promethee_q: float = 0.0   # indifference threshold, fraction of each criterion's range
+    promethee_p: float = 1.0   # preference threshold, fraction of each criterion's range
 
 class AHPRequest(BaseModel):
     decision: str
     criteria: List[Criterion]
     alternatives: List[str]
-    criteria_comparisons: List[float]
+    criteria_comparisons: List[float] = []
     alt_data: List[List[float]]           # objective / subjective
+    # sparse (i, j, a_ij) judgments instead of the full upper triangle; not every pair has to be compared
+    criteria_triples: Optional[List[Tuple[int, int, float]]] = None
+    alt_triples: Optional[List[Optional[List[Tuple[int, int, float]]]]] = None   # per subjective criterion
+    # multi-level criteria: the leaves' global weights replace criteria_comparisons
+    criteria_tree: Optional[CriteriaNode] = None
+    uncertain_data: Optional[List[Optional[UncertainData]]] = None
+    eigen_method: str = "auto"            # "auto", "eig", "power", "rqi", "log_eigh"
+    # "eigenvector", "geometric_mean", "additive", "llsm"; only llsm accepts 0 as a missing judgment
+    priority_method: str = "eigenvector"
+    scoring_method: str = "wsm"           # "wsm", "topsis", "vikor", "promethee", or "all" to compare them
+    scoring: Optional[ScoringConfig] = None
+    simulation: Optional[SimulationConfig] = None
+
+class AltBlock(BaseModel):
+    alt_data: List[List[float]]
     uncertain_data: Optional[List[Optional[UncertainData]]] = None
+    alt_triples: Optional[List[Optional[List[Tuple[int, int, float]]]]] = None
+
+class BatchRequest(BaseModel):
+    problems: List[AHPRequest] = []
+    # shared model: one criteria set scored against many alt-data blocks
+    decision: Optional[str] = None
+    criteria: Optional[List[Criterion]] = None
+    alternatives: Optional[List[str]] = None
+    criteria_comparisons: Optional[List[float]] = None
+    criteria_triples: Optional[List[Tuple[int, int, float]]] = None
+    criteria_tree: Optional[CriteriaNode] = None
+    blocks: List[AltBlock] = []
+    eigen_method: str = "auto"
+    priority_method: str = "eigenvector"
+    scoring_method: str = "wsm"
+    scoring: Optional[ScoringConfig] = None
+    compact: bool = False   # drop detailed_scores / sensitivity from each result
+
+class ScreenRequest(BaseModel):
+    decision: str = ""
+    criteria: List[Criterion]                       # objective / uncertain only
+    criteria_comparisons: List[float] = []
+    criteria_triples: Optional[List[Tuple[int, int, float]]] = None
+    criteria_tree: Optional[CriteriaNode] = None
+    values: List[List[float]]                       # alternatives x criteria (means for uncertain criteria)
+    variances: Optional[List[List[float]]] = None   # alternatives x criteria, read for uncertain criteria
+    risk_factors: Optional[List[float]] = None      # per criterion, read for uncertain criteria
+    alternatives: Optional[List[str]] = None        # row names, echoed for the top rows
+    top_k: int = 10
+    eigen_method: str = "auto"
+    priority_method: str = "eigenvector"
+
+class ModelRequest(BaseModel):
+    decision: str = ""
+    criteria: List[Criterion]                                   # objective / uncertain only
+    criteria_comparisons: List[float] = []
+    criteria_triples: Optional[List[Tuple[int, int, float]]] = None
+    criteria_tree: Optional[CriteriaNode] = None
+    risk_factors: Optional[List[float]] = None                  # per criterion, read for uncertain criteria
+    reference_values: Optional[List[List[float]]] = None        # alternatives x criteria; fixes the normalisation
+    reference_variances: Optional[List[List[float]]] = None
+    eigen_method: str = "auto"
+    priority_method: str = "eigenvector"
+
+class ScoreRequest(BaseModel):
+    values: List[List[float]]                    # alternatives x criteria (means for uncertain criteria)
+    variances: Optional[List[List[float]]] = None
+    alternatives: Optional[List[str]] = None     # row names for "best"
+    normalization: Optional[str] = None          # "frozen", "batch", "pooled" (default: frozen with a reference)
+    top_k: Optional[int] = None                  # rank only the best rows
+
+class HierarchyRequest(BaseModel):
+    tree: CriteriaNode
+    eigen_method: str = "auto"
+    priority_method: str = "eigenvector"
+
+class GroupRequest(BaseModel):
+    n: int
+    comparisons: List[List[float]]                 # one upper-triangle list per evaluator; 0 = not given (llsm)
+    evaluator_weights: Optional[List[float]] = None
+    aggregation: str = "aij"                       # "aij" (judgments) or "aip" (priorities)
+    eigen_method: str = "auto"
+    priority_method: str = "eigenvector"
+    individual: bool = False                       # include every evaluator's weights
+
+class SessionDelta(BaseModel):
+    criterion: Optional[int] = None     # None = criteria comparison (i, j)
+    i: Optional[int] = None             # comparison (i, j) of the criteria or of a subjective criterion
+    j: Optional[int] = None
+    alternative: Optional[int] = None   # objective value / uncertain mean or variance of this alternative
+    field: str = "value"                # "value", "mean", "variance", "risk_factor"
+    value: float
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse({"detail": str(exc)}, status_code=429, headers={"Retry-After": str(exc.retry_after)})
+
+INDEX_PAGE = PrecompressedPage(BASE_DIR / "static" / "index.html")
 
 @app.get("/", response_class=HTMLResponse)
-async def root():
-    with open(BASE_DIR / "static" / "index.html") as f:
-        return f.read()
+async def root(request: Request):
+    return INDEX_PAGE.response(request)
 
 @app.post("/api/validate-criteria")
-async def validate_criteria(payload: dict):
+async def validate_criteria(payload: dict, request: Request):
     n = payload["n"]
-    matrix = build_matrix(n, payload["comparisons"])
-    weights, lmax = calculate_weights(matrix)
-    cr = consistency_ratio(n, lmax)
-    return {"weights": weights, "lambda_max": lmax, "consistency_ratio": cr, "consistent": cr <= 0.1}
-
-@app.post("/api/calculate")
-async def calculate(req: AHPRequest):
-    n_criteria = len(req.criteria)
-    n_alt = len(req.alternatives)
-
-    crit_matrix = build_matrix(n_criteria, req.criteria_comparisons)
-    crit_weights, crit_lmax = calculate_weights(crit_matrix)
-    crit_cr = consistency_ratio(n_criteria, crit_lmax)
-
-    final_scores = np.zeros(n_alt)
-    alt_weights_list = []
-    detailed_scores = {}
-    alt_crs = []
-    uncertain_details = []
-
-    for i, criterion in enumerate(req.criteria):
-
-        if criterion.mode == "objective":
-            alt_weights = normalize_objective(req.alt_data[i], criterion.type)
-            alt_crs.append(None)
-            uncertain_details.append(None)
-
-        elif criterion.mode == "subjective":
-            raw_matrix = build_matrix(n_alt, req.alt_data[i])
-            if criterion.type == "cost":
-                for r in range(n_alt):
-                    for c in range(r + 1, n_alt):
-                        raw_matrix[r][c] = 1.0 / raw_matrix[r][c]
-                        raw_matrix[c][r] = raw_matrix[r][c]
-            alt_weights, alt_lmax = calculate_weights(raw_matrix)
-            alt_crs.append(consistency_ratio(n_alt, alt_lmax))
-            uncertain_details.append(None)
-
-        else:  # uncertain
-            ud = req.uncertain_data[i] if req.uncertain_data else None
-            if ud is None:
-                alt_weights = [1.0/n_alt] * n_alt
-                uncertain_details.append(None)
-            else:
-                adjusted = [m - ud.risk_factor * v for m, v in zip(ud.means, ud.variances)]
-                alt_weights = normalize_shift(adjusted)
-                uncertain_details.append({
-                    "means": ud.means,
-                    "variances": ud.variances,
-                    "risk_factor": ud.risk_factor,
-                    "adjusted": adjusted
-                })
-            alt_crs.append(None)
-
-        alt_weights_list.append(alt_weights)
-        contribution = [crit_weights[i] * w for w in alt_weights]
-        detailed_scores[criterion.name] = contribution
-        final_scores += np.array(contribution)
-
-    ranking = np.argsort(final_scores)[::-1].tolist()
-    cw = np.array(crit_weights)
-    awl = [np.array(w) for w in alt_weights_list]
-    original_best = req.alternatives[int(np.argmax(final_scores))]
-    sensitivity = []
-    for i in range(n_criteria):
-        nw = cw.copy(); nw[i] *= 1.10; nw /= np.sum(nw)
-        ns = sum(nw[j] * awl[j] for j in range(n_criteria))
-        nb = req.alternatives[int(np.argmax(ns))]
-        sensitivity.append({"criterion": req.criteria[i].name, "original_best": original_best,
-                             "new_best": nb, "stable": nb == original_best, "new_scores": ns.tolist()})
-
-    return {
-        "decision": req.decision,
-        "criteria_weights": crit_weights, "criteria_cr": crit_cr, "criteria_consistent": crit_cr <= 0.1,
-        "alt_weights_list": alt_weights_list, "alt_crs": alt_crs,
-        "final_scores": final_scores.tolist(), "ranking": ranking,
-        "best": req.alternatives[ranking[0]],
-        "detailed_scores": detailed_scores, "sensitivity": sensitivity,
-        "uncertain_details": uncertain_details
-    }
-
-app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
+    # live UI feedback: the O(n^2) row geometric mean unless the caller asks otherwise
+    priority_method = payload.get("priority_method", "geometric_mean")
+    timer = METRICS.timer()
+    try:
+        matrix = build_matrix(n, payload["comparisons"])
+        if timer is None:
+            weights, lmax = await OFFLOAD.run(matrix_cost(n), calculate_weights, matrix,
+                                              payload.get("eigen_method", "auto"), priority_method)
+        else:
+            METRICS.observe_size("matrix", n)
+            with timer.time("solve"):
+                weights, lmax = await OFFLOAD.run(matrix_cost(n), calculate_weights, matrix,
+                                                  payload.get("eigen_method", "auto"), priority_method)
+        cr = float(consistency_ratio(n, lmax))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    gci = geometric_consistency_index(matrix, weights)
+    return timed_response(request, {"weights": weights.tolist(), "lambda_max": lmax, "consistency_ratio": cr,
+                                    "consistent": cr <= CONSISTENCY_THRESHOLD, "priority_method": priority_method,
+                                    "gci": gci, "gci_consistent": gci <= gci_threshold(n)}, timer)
+
+@app.post("/api/repair-suggestions")
+async def repair(payload: dict):
+    """Judgments most responsible for CR > 0.1, with values that bring it under the threshold."""
+    n = payload["n"]
+    try:
+        matrix = build_matrix(n, payload["comparisons"])
+        # one stacked solve of `top` candidates, then up to n(n-1) plan steps of two matrices each
+        return await OFFLOAD.run(matrix_cost(n) * (payload.get("top", 5) + 2 * n * n), repair_suggestions, matrix,
+                                 payload.get("eigen_method", "auto"), payload.get("priority_method", "eigenvector"),
+                                 payload.get("threshold", CONSISTENCY_THRESHOLD), payload.get("top", 5),
+                                 payload.get("max_changes"))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@binary.post("/api/screen")
+async def screen(req: ScreenRequest, request: Request):
+    """Top-k and score summary of a dense alternatives x criteria matrix; send large ones as MessagePack buffers."""
+    problem = restore_arrays(request, req.model_dump())
+    values = problem["values"]
+    cost = len(values) * len(req.criteria) * 4
+    try:
+        report = await OFFLOAD.run(cost, screen_problem, problem, calculate_weights)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return respond(request, report, json_response=True)
+
+@binary.post("/api/models")
+async def register_model(req: ModelRequest, request: Request):
+    """Solve the criteria once and keep them, with the reference normalisation, for /api/models/{id}/score."""
+    problem = restore_arrays(request, req.model_dump())
+    try:
+        reference = problem["reference_values"]
+        cost = problem_cost({**problem, "alternatives": () if reference is None else reference})
+        model = await OFFLOAD.run(cost, ScoringModel.from_problem, problem, calculate_weights)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    # the same registration gets the same id
+    model_id = canonical_hash(problem)[:24]
+    MODELS.set(model_id, model)
+    return {"model_id": model_id, **model.describe()}
+
+def get_model(model_id: str) -> ScoringModel:
+    model = MODELS.get(model_id)
+    if model is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired model")
+    return model
+
+@binary.post("/api/models/{model_id}/score")
+async def score_with_model(model_id: str, req: ScoreRequest, request: Request):
+    """Scores and ranking of new alternatives against a registered model, O(criteria) per alternative."""
+    model = get_model(model_id)
+    body = restore_arrays(request, req.model_dump())
+    if req.alternatives and len(req.alternatives) != len(body["values"]):
+        raise HTTPException(status_code=422, detail="alternatives must name every row of values")
+    try:
+        result = await OFFLOAD.run(len(body["values"]) * len(model.criteria), model.score, body["values"],
+                                   body["variances"], req.normalization, req.top_k)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    MODELS.set(model_id, model)
+    if req.alternatives:
+        result["best"] = req.alternatives[result["ranking"][0]]
+    return respond(request, {"model_id": model_id, **result}, json_response=True)
+
+@app.get("/api/models/{model_id}")
+async def describe_model(model_id: str):
+    return {"model_id": model_id, **get_model(model_id).describe()}
+
+@app.delete("/api/models/{model_id}")
+async def delete_model(model_id: str):
+    if MODELS.pop(model_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired model")
+    return {"deleted": model_id}
+
+@app.post("/api/hierarchy")
+async def hierarchy(req: HierarchyRequest):
+    """Local and global weights and per-node consistency of a criteria tree, all same-size nodes solved together."""
+    tree = req.tree.model_dump()
+    try:
+        return await OFFLOAD.run(tree_cost(tree), solve_hierarchy, tree, req.eigen_method, req.priority_method,
+                                 calculate_weights)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@binary.post("/api/group")
+async def group(req: GroupRequest, request: Request):
+    """Group priorities, consistency and consensus for many evaluators' judgments of the same n items."""
+    body = restore_arrays(request, req.model_dump())
+    try:
+        report = await OFFLOAD.run(matrix_cost(req.n) * len(body["comparisons"]), group_prioritize, body["comparisons"],
+                                   req.n, req.aggregation, body["evaluator_weights"], req.eigen_method,
+                                   req.priority_method, req.individual)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return respond(request, report, json_response=True)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition."""
+    return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/cache-stats")
+async def cache_stats():
+    return {"results": RESULT_CACHE.stats(), "weights": WEIGHTS_CACHE.stats(), "offload": OFFLOAD.stats(),
+            "sessions": SESSIONS.stats(), "models": MODELS.stats()}
+
+@binary.post("/api/calculate")
+async def calculate(req: AHPRequest, request: Request):
+    problem = restore_arrays(request, req.model_dump())
+    timer = METRICS.timer()
+    if timer is not None:
+        METRICS.observe_size("criteria", len(problem["criteria"]))
+        METRICS.observe_size("alternatives", len(problem["alternatives"]))
+    return timed_response(request, assemble_stages(await cached_stages(problem, timer)), timer)
+
+async def cached_stages(problem: dict, timer: StageTimer = None) -> list:
+    key = canonical_hash(problem)
+    stages = RESULT_CACHE.get(key)
+    if stages is None:
+        try:
+            stages, durations = await OFFLOAD.run(problem_cost(problem), solve_stages, problem)
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        RESULT_CACHE.set(key, stages)
+        if timer is not None:
+            timer.durations.update(durations)
+    return stages
+
+@app.post("/api/session")
+async def open_session(req: AHPRequest):
+    """Keep the solved problem server-side so single-value edits skip the full pipeline."""
+    problem = req.model_dump()
+    stages = await cached_stages(problem)
+    try:
+        # the session takes over the pipeline's weights, so nothing is solved twice
+        session = DecisionSession(problem, next(data for stage, data in stages if stage == "weights"))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    session_id = secrets.token_urlsafe(16)
+    SESSIONS.set(session_id, session)
+    return {"session_id": session_id, **assemble_stages(stages)}
+
+def get_session(session_id: str) -> DecisionSession:
+    session = SESSIONS.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired session")
+    return session
+
+@app.post("/api/session/{session_id}/update")
+async def update_session(session_id: str, delta: SessionDelta):
+    """
+    Apply one edit: only the affected matrix is re-solved (warm-started) and the
+    final scores are corrected in place. Runs on the event loop, so updates to a
+    session are applied one at a time.
+    """
+    session = get_session(session_id)
+    try:
+        result = session.apply(delta.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    SESSIONS.set(session_id, session)
+    return {"session_id": session_id, **result}
+
+@app.get("/api/session/{session_id}")
+async def session_result(session_id: str):
+    """The full /api/calculate response (sensitivity, stability, ...) for the session's current inputs."""
+    problem = copy.deepcopy(get_session(session_id).problem)
+    return {"session_id": session_id, **assemble_stages(await cached_stages(problem))}
+
+@app.delete("/api/session/{session_id}")
+async def close_session(session_id: str):
+    if SESSIONS.pop(session_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired session")
+    return {"closed": session_id}
+
+@app.post("/api/calculate-stream")
+async def calculate_stream(req: AHPRequest, request: Request, format: Optional[str] = None):
+    """Same result as /api/calculate, sent stage by stage as NDJSON (default) or Server-Sent Events."""
+    sse = format == "sse" or (format is None and "text/event-stream" in request.headers.get("accept", ""))
+    problem = req.model_dump()
+    key = canonical_hash(problem)
+    cost = problem_cost(problem)
+    # one lookup per request, so the cache statistics count it once
+    stages = RESULT_CACHE.get(key)
+    if stages is None:
+        OFFLOAD.admit(cost)
+
+    def events():
+        # a fresh solve collects its stages for the cache; a cached result is replayed as is
+        source, done = (stages, None) if stages is not None else (run_stages(problem, cost), [])
+        try:
+            for stage, data in source:
+                if done is not None:
+                    done.append((stage, data))
+                yield encode_event(stage, data, sse)
+        except (HTTPException, Overloaded) as e:
+            status, detail = (e.status_code, e.detail) if isinstance(e, HTTPException) else (429, str(e))
+            yield encode_event("error", {"status_code": status, "detail": detail}, sse)
+            return
+        if done is not None:
+            RESULT_CACHE.set(key, done)
+        yield encode_event("done", {}, sse)
+
+    # a sync generator is iterated in the threadpool, so the solve does not block the event loop
+    return StreamingResponse(events(), media_type="text/event-stream" if sse else "application/x-ndjson",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+def encode_event(stage: str, data: dict, sse: bool) -> str:
+    if sse:
+        return f"event: {stage}\ndata: {json.dumps(data)}\n\n"
+    return json.dumps({"stage": stage, "data": data}) + "\n"
+
+def solve_stages(problem: dict):
+    """(stages, per-stage seconds); module level so the process pool can pickle it."""
+    with METRICS.collecting() as timer:
+        if timer is None:
+            return list(iter_stages(problem, calculate_weights)), {}
+        return list(timer.timed(iter_stages(problem, calculate_weights))), timer.durations
+
+def run_stages(problem: dict, cost: int):
+    """The engine pipeline with the cached matrix solver; engine ValueErrors become 422s."""
+    # each next() may run on a different threadpool thread, so only whole stages are timed
+    timer = StageTimer() if METRICS.enabled else None
+    with OFFLOAD.slot(cost):
+        try:
+            yield from iter_stages(problem, calculate_weights) if timer is None else \
+                timer.timed(iter_stages(problem, calculate_weights))
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    METRICS.record_stages(timer)
+
+@binary.post("/api/calculate-batch")
+async def calculate_batch(req: BatchRequest, request: Request):
+    body = restore_arrays(request, req.model_dump())
+    problems = body["problems"]
+    if req.blocks:
+        if req.criteria is None or req.alternatives is None or (req.criteria_comparisons is None
+                                                                and req.criteria_triples is None
+                                                                and req.criteria_tree is None):
+            raise HTTPException(status_code=422, detail="blocks require criteria, alternatives and "
+                                                        "criteria_comparisons, criteria_triples or criteria_tree")
+        shared = {"decision": req.decision or "", "criteria": body["criteria"],
+                  "alternatives": req.alternatives, "criteria_comparisons": body["criteria_comparisons"],
+                  "criteria_triples": req.criteria_triples, "criteria_tree": body["criteria_tree"],
+                  "eigen_method": req.eigen_method, "priority_method": req.priority_method,
+                  "scoring_method": req.scoring_method, "scoring": body["scoring"]}
+        if req.criteria_comparisons is None:
+            shared["criteria_comparisons"] = []
+        problems += [{**shared, **blk} for blk in body["blocks"]]
+
+    # results are plain lists/floats already; skip FastAPI's recursive jsonable_encoder pass
+    cost = sum(map(problem_cost, problems))
+    timer = METRICS.timer()
+    try:
+        if timer is None:
+            results = await OFFLOAD.run(cost, evaluate_batch, problems, req.compact)
+        else:
+            METRICS.observe_size("batch", len(problems))
+            with timer.time("evaluate"):
+                results = await OFFLOAD.run(cost, evaluate_batch, problems, req.compact)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return timed_response(request, {"results": results}, timer)
+
+app.include_router(binary)
+app.mount("/static", PrecompressedStaticFiles(directory=BASE_DIR / "static"), name="static")
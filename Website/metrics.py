@@ -0,0 +1,264 @@
+"""
+Lightweight request and stage instrumentation, exported in Prometheus text format.
+
+Everything is off by default:
+
+    AHP_METRICS=1        record request counts and latencies, per-stage durations
+                         and problem / matrix sizes for /metrics
+    AHP_SERVER_TIMING=1  add a Server-Timing header with the stage durations of
+                         each /api/calculate, /api/calculate-batch and
+                         /api/validate-criteria response
+
+When both are off, MetricsMiddleware is not installed and the hot path does a
+single attribute check per stage. Stage durations are disjoint: a matrix
+solve is reported as "solve" and not again in the "weights" stage around it. Stage durations are collected per request
+in a StageTimer that runs in the thread or process doing the solve, and
+matrix solves report to the timer of their thread. So the timings come back
+with the result, whatever pool executed it.
+
+Histograms use fixed buckets. Request latency is a summary whose quantiles
+come from the last WINDOW requests per route.
+"""
+import bisect
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+DURATION_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+                    5.0, 10.0)
+SIZE_BUCKETS = (2, 3, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+WINDOW = 1024
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{str(v)}"' for k, v in labels.items()) + "}"
+
+
+def _value(v) -> str:
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: dict) -> list:
+        out, cumulative = [], 0
+        for le, n in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += n
+            out.append(f"{name}_bucket{_labels({**labels, 'le': le})} {cumulative}")
+        out.append(f"{name}_sum{_labels(labels)} {_value(self.sum)}")
+        out.append(f"{name}_count{_labels(labels)} {self.count}")
+        return out
+
+
+class Summary:
+    def __init__(self, window: int = WINDOW):
+        self.recent = deque(maxlen=window)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.recent.append(value)
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: dict) -> list:
+        ordered = sorted(self.recent)
+        out = [f"{name}{_labels({**labels, 'quantile': q})} "
+               f"{_value(ordered[min(len(ordered) - 1, int(q * len(ordered)))]) if ordered else 'NaN'}"
+               for q in QUANTILES]
+        out.append(f"{name}_sum{_labels(labels)} {_value(self.sum)}")
+        out.append(f"{name}_count{_labels(labels)} {self.count}")
+        return out
+
+
+class StageTimer:
+    """
+    Accumulated seconds per stage for one request, in insertion order. Stages
+    may nest (a matrix solve inside "weights"); the outer stage is charged only
+    the time its inner stages did not take, so the durations are disjoint.
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self._charged = 0.0   # seconds charged so far by stages that have ended
+
+    def add(self, stage: str, seconds: float):
+        self.durations[stage] = self.durations.get(stage, 0.0) + seconds
+
+    def _close(self, stage: str, start: float, charged: float):
+        elapsed = time.perf_counter() - start
+        self.add(stage, elapsed - (self._charged - charged))
+        self._charged = charged + elapsed
+
+    @contextmanager
+    def time(self, stage: str):
+        start, charged = time.perf_counter(), self._charged
+        try:
+            yield
+        finally:
+            self._close(stage, start, charged)
+
+    def timed(self, stages):
+        """Pass (stage, data) pairs through, charging the time to produce each one to its stage."""
+        it = iter(stages)
+        while True:
+            start, charged = time.perf_counter(), self._charged
+            try:
+                stage, data = next(it)
+            except StopIteration:
+                return
+            self._close(stage, start, charged)
+            yield stage, data
+
+    def header(self) -> str:
+        return ", ".join(f"{stage};dur={seconds * 1e3:.3f}" for stage, seconds in self.durations.items())
+
+
+class Metrics:
+    def __init__(self, enabled: bool = False, server_timing: bool = False):
+        self.enabled = enabled
+        self.server_timing = server_timing
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.requests = {}    # (route, method, status) -> count
+        self.latency = {}     # route -> Summary
+        self.stages = {}      # stage -> Histogram
+        self.sizes = {}       # (kind) -> Histogram
+        self.gauges = []      # callables returning [(name, help, type, labels, value)]
+
+    @classmethod
+    def from_env(cls) -> "Metrics":
+        on = lambda name: os.environ.get(name, "").lower() in ("1", "true", "yes", "on")
+        return cls(enabled=on("AHP_METRICS"), server_timing=on("AHP_SERVER_TIMING"))
+
+    @property
+    def timing(self) -> bool:
+        """Whether per-stage durations are collected at all."""
+        return self.enabled or self.server_timing
+
+    # --- per-request stage timers ---------------------------------------------------------
+
+    def timer(self):
+        """A fresh StageTimer, or None when timing is off."""
+        return StageTimer() if self.timing else None
+
+    @contextmanager
+    def collecting(self):
+        """A StageTimer for the work done in this thread (None when timing is off)."""
+        if not self.timing:
+            yield None
+            return
+        timer = StageTimer()
+        previous = getattr(self._local, "timer", None)
+        self._local.timer = timer
+        try:
+            yield timer
+        finally:
+            self._local.timer = previous
+
+    def current(self):
+        return getattr(self._local, "timer", None) if self.timing else None
+
+    def record_stages(self, timer: StageTimer):
+        if not self.enabled or timer is None:
+            return
+        with self._lock:
+            for stage, seconds in timer.durations.items():
+                self.stages.setdefault(stage, Histogram(DURATION_BUCKETS)).observe(seconds)
+
+    def observe_size(self, kind: str, value: int):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.sizes.setdefault(kind, Histogram(SIZE_BUCKETS)).observe(value)
+
+    def observe_request(self, route: str, method: str, status: int, seconds: float):
+        with self._lock:
+            key = (route, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.latency.setdefault(route, Summary()).observe(seconds)
+
+    def add_gauges(self, fn):
+        self.gauges.append(fn)
+
+    # --- exposition ----------------------------------------------------------------------
+
+    def render(self) -> str:
+        lines = ["# HELP ahp_metrics_enabled Whether request and stage metrics are being recorded.",
+                 "# TYPE ahp_metrics_enabled gauge", f"ahp_metrics_enabled {int(self.enabled)}"]
+        with self._lock:
+            lines += ["# HELP ahp_requests_total HTTP requests by route, method and status.",
+                      "# TYPE ahp_requests_total counter"]
+            lines += [f"ahp_requests_total{_labels({'route': r, 'method': m, 'status': s})} {n}"
+                      for (r, m, s), n in sorted(self.requests.items())]
+            lines += ["# HELP ahp_request_duration_seconds Request latency until the response starts.",
+                      "# TYPE ahp_request_duration_seconds summary"]
+            for route, summary in sorted(self.latency.items()):
+                lines += summary.lines("ahp_request_duration_seconds", {"route": route})
+            lines += ["# HELP ahp_stage_duration_seconds Time spent per evaluation stage.",
+                      "# TYPE ahp_stage_duration_seconds histogram"]
+            for stage, hist in sorted(self.stages.items()):
+                lines += hist.lines("ahp_stage_duration_seconds", {"stage": stage})
+            lines += ["# HELP ahp_problem_size Matrix sizes solved and problem dimensions received.",
+                      "# TYPE ahp_problem_size histogram"]
+            for kind, hist in sorted(self.sizes.items()):
+                lines += hist.lines("ahp_problem_size", {"kind": kind})
+        seen = set()
+        for fn in self.gauges:
+            for name, help_text, kind, labels, value in fn():
+                if name not in seen:
+                    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                    seen.add(name)
+                lines.append(f"{name}{_labels(labels)} {_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Counts requests and times them until the response starts; appends total to Server-Timing."""
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+                elapsed = time.perf_counter() - start
+                if self.metrics.server_timing:
+                    headers = list(message.get("headers", []))
+                    total = f"total;dur={elapsed * 1e3:.3f}".encode()
+                    for k, (name, value) in enumerate(headers):
+                        if name.lower() == b"server-timing":
+                            headers[k] = (name, value + b", " + total)
+                            break
+                    else:
+                        headers.append((b"server-timing", total))
+                    message = {**message, "headers": headers}
+                if self.metrics.enabled:
+                    route = scope.get("route")
+                    self.metrics.observe_request(getattr(route, "path", "unmatched"), scope["method"],
+                                                 status[0], elapsed)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
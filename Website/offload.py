@@ -0,0 +1,162 @@
+"""
+Execution layer that keeps CPU-bound solves off the asyncio event loop.
+
+Each request is given a rough cost (floating-point work of its matrix
+solves and simulation draws). Cheap requests run inline, since handing them
+to a pool costs more than solving them; heavier ones go to a thread pool
+(NumPy releases the GIL in its kernels) and the heaviest to a process pool
+when one is configured. At most `max_queue` offloaded jobs may be pending;
+past that new heavy requests are refused with Overloaded (mapped to a 429),
+so small requests keep flowing under mixed load.
+
+Configuration comes from the environment:
+    AHP_OFFLOAD_INLINE_MAX   cost below which work runs inline (default 50000)
+    AHP_OFFLOAD_PROCESS_MIN  cost from which the process pool is used (default 20000000)
+    AHP_OFFLOAD_THREADS      thread pool size (default: CPU count)
+    AHP_OFFLOAD_PROCESSES    process pool size, 0 disables it (default 0)
+    AHP_OFFLOAD_MAX_QUEUE    offloaded jobs allowed in flight (default 4 x threads)
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
+
+class Overloaded(Exception):
+    """Raised when the offload queue is full; the caller should retry later."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("server is busy, retry later")
+        self.retry_after = retry_after
+
+
+def _pairs(n: int) -> int:
+    return n * (n - 1) // 2
+
+
+def matrix_cost(n: int) -> int:
+    return n ** 3
+
+
+# sparse (i, j, value) judgments cost O(edges) per solver iteration
+SPARSE_ITERATIONS = 50
+
+
+def judgment_cost(n: int, triples=None) -> int:
+    return matrix_cost(n) if triples is None else SPARSE_ITERATIONS * len(triples)
+
+
+def tree_cost(node: dict) -> int:
+    """Solve cost of every node matrix in a criteria hierarchy."""
+    children = node.get("children") or []
+    return matrix_cost(len(children)) + sum(map(tree_cost, children))
+
+
+def problem_cost(problem: dict) -> int:
+    """Approximate work of one problem in the AHPRequest layout."""
+    n_criteria, n_alt = len(problem["criteria"]), len(problem["alternatives"])
+    alt_triples = problem.get("alt_triples") or []
+    tree = problem.get("criteria_tree")
+    solve = (judgment_cost(n_criteria, problem.get("criteria_triples")) if tree is None else tree_cost(tree)) + sum(
+        judgment_cost(n_alt, alt_triples[i] if i < len(alt_triples) else None)
+        for i, c in enumerate(problem["criteria"]) if c["mode"] == "subjective")
+    cost = solve + n_criteria * n_alt
+    if problem.get("scoring_method", "wsm") in ("promethee", "all"):
+        # pairwise preference flows, unless the thresholds allow the sorted closed form
+        cost += n_criteria * n_alt ** 2
+    sim = problem.get("simulation")
+    if sim:
+        per_draw = n_criteria * n_alt
+        if sim.get("judgment_spread", 0.0) > 0:
+            per_draw += solve + _pairs(n_criteria) + _pairs(n_alt) * n_criteria
+        cost += sim.get("n_draws", 10000) * per_draw
+    return cost
+
+
+class Offloader:
+    def __init__(self, inline_max: int = 50_000, process_min: int = 20_000_000, threads: int = None,
+                 processes: int = 0, max_queue: int = None):
+        self.inline_max = inline_max
+        self.process_min = process_min
+        self.threads = threads or os.cpu_count() or 1
+        self.processes = processes
+        self.max_queue = max_queue or 4 * self.threads
+        self._thread_pool = None
+        self._process_pool = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.counters = {"inline": 0, "thread": 0, "process": 0, "rejected": 0}
+
+    @classmethod
+    def from_env(cls) -> "Offloader":
+        env = os.environ.get
+        return cls(inline_max=int(env("AHP_OFFLOAD_INLINE_MAX", 50_000)),
+                   process_min=int(env("AHP_OFFLOAD_PROCESS_MIN", 20_000_000)),
+                   threads=int(env("AHP_OFFLOAD_THREADS", 0)) or None,
+                   processes=int(env("AHP_OFFLOAD_PROCESSES", 0)),
+                   max_queue=int(env("AHP_OFFLOAD_MAX_QUEUE", 0)) or None)
+
+    def _count(self, route: str):
+        with self._lock:
+            self.counters[route] += 1
+
+    def _pool(self, cost: int):
+        if self.processes > 0 and cost >= self.process_min:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.processes)
+            return "process", self._process_pool
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="ahp-solve")
+        return "thread", self._thread_pool
+
+    def admit(self, cost: int):
+        """Raise Overloaded if work of this cost would be refused right now."""
+        if cost >= self.inline_max and self._in_flight >= self.max_queue:
+            self._count("rejected")
+            raise Overloaded()
+
+    @contextmanager
+    def slot(self, cost: int):
+        """
+        Hold a queue slot for work of this cost; yields False for inline-sized
+        work, which takes no slot. Used directly by work that is already run
+        off the loop (streaming generators).
+        """
+        if cost < self.inline_max:
+            self._count("inline")
+            yield False
+            return
+        with self._lock:
+            full = self._in_flight >= self.max_queue
+            if not full:
+                self._in_flight += 1
+        if full:
+            self._count("rejected")
+            raise Overloaded()
+        try:
+            yield True
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def run(self, cost: int, fn, *args):
+        """fn(*args) inline or on a pool according to cost; process-pool work must be picklable."""
+        with self.slot(cost) as offloaded:
+            if not offloaded:
+                return fn(*args)
+            route, pool = self._pool(cost)
+            self._count(route)
+            return await asyncio.get_running_loop().run_in_executor(pool, partial(fn, *args))
+
+    def stats(self) -> dict:
+        return {"in_flight": self._in_flight, "max_queue": self.max_queue, "threads": self.threads,
+                "processes": self.processes, "inline_max": self.inline_max, "process_min": self.process_min,
+                **self.counters}
+
+    def shutdown(self):
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = self._process_pool = None
@@ -0,0 +1,116 @@
+"""
+In-memory, pre-compressed page serving and a StaticFiles variant that
+serves pre-built .br / .gz siblings of assets.
+
+Brotli is optional: install the `brotli` package to enable the br variants.
+Run `python static_assets.py` to write .gz/.br siblings for everything in static/.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+from pathlib import Path
+
+from fastapi import Request
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PAGE_CACHE_CONTROL = "public, max-age=86400"
+
+# preferred encoding first; suffix is used both for ETags and sibling files
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q=") and q[2:].strip("0.") == "":
+            continue   # q=0 / q=0.0 means "not acceptable"
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=11)
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def available_encodings():
+    return [(enc, suffix) for enc, suffix in ENCODINGS if enc != "br" or brotli is not None]
+
+
+class PrecompressedPage:
+    """A file read and compressed once at startup, served with strong per-encoding ETags."""
+
+    def __init__(self, path: Path, media_type: str = "text/html; charset=utf-8",
+                 cache_control: str = PAGE_CACHE_CONTROL):
+        body = Path(path).read_bytes()
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.variants = {None: (f'"{digest}"', body)}
+        for encoding, suffix in available_encodings():
+            self.variants[encoding] = (f'"{digest}{suffix}"', compress(body, encoding))
+
+    def response(self, request: Request) -> Response:
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        encoding = next((enc for enc, _ in ENCODINGS if enc in accepted and enc in self.variants), None)
+        etag, body = self.variants[encoding]
+        headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if "*" in tags or etag in tags:
+                return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(body, media_type=self.media_type, headers=headers)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """Serves `asset.br` / `asset.gz` in place of `asset` when present and accepted by the client."""
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            try:
+                compressed_stat = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            media_type = mimetypes.guess_type(str(full_path))[0] or "application/octet-stream"
+            response = super().file_response(f"{full_path}{suffix}", compressed_stat, scope, status_code)
+            if isinstance(response, FileResponse):
+                response.media_type = media_type
+                response.headers["content-type"] = media_type + ("; charset=utf-8" if media_type.startswith("text/") else "")
+                response.headers["content-encoding"] = encoding
+            response.headers["vary"] = "Accept-Encoding"
+            return response
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers["vary"] = "Accept-Encoding"
+        return response
+
+
+def precompress_directory(directory: Path):
+    for path in Path(directory).rglob("*"):
+        if not path.is_file() or path.suffix in (".gz", ".br"):
+            continue
+        body = path.read_bytes()
+        for encoding, suffix in available_encodings():
+            Path(f"{path}{suffix}").write_bytes(compress(body, encoding))
+
+
+if __name__ == "__main__":
+    precompress_directory(Path(__file__).parent / "static")
@@ -1,10 +1,20 @@
+import argparse
+import csv
+import json
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+
 import numpy as np
 
-# Random Index values
-RI = {
-    1: 0.00, 2: 0.00, 3: 0.58, 4: 0.90, 5: 1.12,
-    6: 1.24, 7: 1.32, 8: 1.41, 9: 1.45, 10: 1.49
-}
+# the numerical core lives next to the web app so the deployed Website/ stays self-contained
+sys.path.insert(0, str(Path(__file__).parent / "Website"))
+from ahp_engine import (CONSISTENCY_THRESHOLD, LOG_METHODS, PRIORITY_METHODS, SCORING_METHODS, calculate_weights,
+                        consistency_ratio, evaluate_batch, geometric_consistency_index, method_report, method_scores,
+                        normalize_objective, normalize_shift, open_matrix, perturbation_scores, rank,
+                        repair_suggestions, risk_adjusted, screen_problem, stability_intervals)
 
 # ---------------- Utility Functions ---------------- #
 
@@ -20,68 +30,44 @@ def get_valid_number(prompt):
             print("Invalid input. Enter a numeric value.")
 
 
-def calculate_weights(matrix):
-    eigenvalues, eigenvectors = np.linalg.eig(matrix)
-    max_index = np.argmax(eigenvalues.real)
-    lambda_max = eigenvalues.real[max_index]
-    weights = eigenvectors[:, max_index].real
-    weights = weights / np.sum(weights)
-    return weights, lambda_max
-
-
-def consistency_ratio(matrix, lambda_max):
-    n = matrix.shape[0]
-    if n < 3:
-        return 0
-    CI = (lambda_max - n) / (n - 1)
-    return CI / RI[n]
-
-
-def normalize_objective(values, criterion_type):
-    values = np.array(values)
-
-    if criterion_type == "benefit":
-        normalized = values / np.sum(values)
-    else:
-        inverted = 1 / values
-        normalized = inverted / np.sum(inverted)
-
-    return normalized
-
-
-def normalize_shift(values):
-    """
-    Used for uncertain criteria in case adjusted values become negative.
-    Shifts them to positive before normalization.
-    """
-    values = np.array(values)
-    min_val = np.min(values)
-
-    if min_val <= 0:
-        values = values - min_val + 0.0001
-
-    return values / np.sum(values)
-
-
-def sensitivity_analysis(criteria_weights, alt_weights_list, alternatives):
+def suggest_repairs(matrix, labels, priority_method="eigenvector"):
+    """Print the judgment changes that bring an inconsistent matrix under CR 0.1."""
+    report = repair_suggestions(matrix, priority_method=priority_method)
+    if not report["repairs"]:
+        return
+    print("Judgments to revisit:")
+    for r in report["repairs"]:
+        print(f"  '{labels[r['i']]}' vs '{labels[r['j']]}': {round(r['from'], 3)} -> {round(r['to'], 3)}"
+              f"  (CR {round(r['cr'], 4)})")
+
+
+def compare_methods(scoring_method, criteria_weights, alt_weights_list, alternatives):
+    """Rankings of the other aggregation methods next to the weighted sum."""
+    results = method_scores(scoring_method, criteria_weights, np.array(alt_weights_list, dtype=float))
+    report = method_report(scoring_method, results, alternatives)
+    print("\n=========== Other Aggregation Methods ===========")
+    for name, res in report["methods"].items():
+        if name == "wsm":
+            continue
+        print(f"\n{name.upper()} (higher is better):")
+        for alt, score in zip(alternatives, res["scores"]):
+            print(alt, ":", round(score, 4))
+        print("Ranking:", " > ".join(alternatives[i] for i in res["ranking"]))
+        print("Best:", res["best"])
+    print("\nAgreement of the rankings (Kendall's W):", round(report["method_agreement"], 4))
+
+
+def sensitivity_analysis(criteria_weights, alt_weights_list, alternatives, criteria=None):
     print("\n=========== Sensitivity Analysis ===========\n")
 
-    original_scores = np.zeros(len(alternatives))
-    for i in range(len(criteria_weights)):
-        original_scores += criteria_weights[i] * alt_weights_list[i]
+    criteria_weights = np.asarray(criteria_weights, dtype=float)
+    alt_weights = np.array(alt_weights_list, dtype=float)
+    original_scores = criteria_weights @ alt_weights
 
     original_best = alternatives[np.argmax(original_scores)]
     print("Original Best:", original_best, "\n")
 
-    for i in range(len(criteria_weights)):
-
-        new_weights = criteria_weights.copy()
-        new_weights[i] *= 1.10
-        new_weights = new_weights / np.sum(new_weights)
-
-        new_scores = np.zeros(len(alternatives))
-        for j in range(len(new_weights)):
-            new_scores += new_weights[j] * alt_weights_list[j]
+    for i, new_scores in enumerate(perturbation_scores(criteria_weights, alt_weights)):
 
         new_best = alternatives[np.argmax(new_scores)]
 
@@ -92,179 +78,390 @@ def sensitivity_analysis(criteria_weights, alt_weights_list, alternatives):
         else:
             print("Changed (Sensitive)\n")
 
+    # Exact weight range for each criterion over which the best choice holds
+    print("Stability Region (other weights rescaled proportionally):\n")
+    st = stability_intervals(criteria_weights, alt_weights, full_ranking=True)
 
-# ---------------- MAIN PROGRAM ---------------- #
-
-print("========== Hybrid AHP Decision System ==========\n")
-
-decision = input("What decision are you making? ")
-
-# -------- Criteria -------- #
-
-num_criteria = int(input("Number of criteria: "))
-
-criteria = []
-criteria_types = []
-criteria_modes = []
+    for i in range(len(criteria_weights)):
+        label = criteria[i] if criteria else f"Criterion {i+1}"
+        print(f"{label}: weight {st['weight'][i]:.4f} → best stays {original_best} "
+              f"for weight in [{st['lower'][i]:.4f}, {st['upper'][i]:.4f}], "
+              f"full ranking for [{st['rank_lower'][i]:.4f}, {st['rank_upper'][i]:.4f}]")
+        for bound, by in (("lower", st["lower_by"][i]), ("upper", st["upper_by"][i])):
+            if by >= 0:
+                print(f"    past the {bound} bound {alternatives[by]} takes over")
 
-for i in range(num_criteria):
 
-    name = input(f"\nEnter criterion {i+1}: ")
+# ---------------- BATCH MODE ---------------- #
 
-    # Benefit / Cost
-    while True:
-        print("Type?")
-        print("1. Benefit (Higher is better)")
-        print("2. Cost (Lower is better)")
-        choice = input("Enter 1 or 2: ")
-        if choice == "1":
-            ctype = "benefit"
-            break
-        elif choice == "2":
-            ctype = "cost"
-            break
-        else:
-            print("Invalid input.")
+# CSV cells holding lists/objects are JSON-encoded; the rest are plain strings
+CSV_JSON_COLUMNS = ("criteria", "alternatives", "criteria_comparisons", "alt_data", "criteria_triples",
+                    "alt_triples", "criteria_tree", "uncertain_data", "scoring", "simulation")
 
-    # Mode
-    while True:
-        print("Mode?")
-        print("1. Objective")
-        print("2. Subjective (Pairwise)")
-        print("3. Uncertain (Mean–Variance)")
-        mode_choice = input("Enter 1, 2 or 3: ")
-        if mode_choice == "1":
-            mode = "objective"
-            break
-        elif mode_choice == "2":
-            mode = "subjective"
-            break
-        elif mode_choice == "3":
-            mode = "uncertain"
-            break
-        else:
-            print("Invalid input.")
-
-    criteria.append(name)
-    criteria_types.append(ctype)
-    criteria_modes.append(mode)
 
-# -------- Alternatives -------- #
+def read_records(stream, fmt):
+    """Yield raw records (JSONL lines or CSV rows) one at a time; the file is never loaded whole."""
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+    else:
+        yield from (line for line in stream if line.strip())
 
-num_alternatives = int(input("\nNumber of alternatives: "))
-alternatives = [input(f"Enter alternative {i+1}: ") for i in range(num_alternatives)]
 
-# -------- Criteria Weights (AHP) -------- #
+def parse_record(raw, fmt):
+    """Problem dict in the AHPRequest layout, or an error message."""
+    try:
+        if fmt == "csv":
+            return {k: json.loads(v) if k in CSV_JSON_COLUMNS else v for k, v in raw.items() if v}
+        return json.loads(raw)
+    except json.JSONDecodeError as e:
+        return f"invalid JSON: {e}"
 
-criteria_matrix = np.ones((num_criteria, num_criteria))
 
-print("\n=== Pairwise Comparison: Criteria Importance ===")
+def score_records(records, compact=False):
+    """
+    Score parsed records with the vectorized engine. If any record is
+    malformed, fall back to one at a time so only the bad ones become errors.
+    """
+    if all(isinstance(r, dict) for r in records):
+        try:
+            return evaluate_batch(records, compact)
+        except (KeyError, TypeError, ValueError, IndexError):
+            pass
+    results = []
+    for r in records:
+        if isinstance(r, str):
+            results.append({"error": r})
+            continue
+        try:
+            results.append(evaluate_batch([r], compact)[0])
+        except KeyError as e:
+            results.append({"error": f"missing field {e}"})
+        except (TypeError, ValueError, IndexError) as e:
+            results.append({"error": str(e)})
+    return results
 
-for i in range(num_criteria):
-    for j in range(i + 1, num_criteria):
-        value = get_valid_number(
-            f"How much is '{criteria[i]}' preferred over '{criteria[j]}'? "
-        )
-        criteria_matrix[i][j] = value
-        criteria_matrix[j][i] = 1 / value
 
-criteria_weights, lambda_max = calculate_weights(criteria_matrix)
-cr = consistency_ratio(criteria_matrix, lambda_max)
+def score_chunk(start, raw_records, fmt, compact=False, defaults=None):
+    """
+    Parse, score and encode one chunk; runs in a worker process when
+    --workers is set. defaults fill fields a record leaves out.
+    Returns (output lines, number of failed records).
+    """
+    records = [parse_record(r, fmt) for r in raw_records]
+    if defaults:
+        records = [{**defaults, **r} if isinstance(r, dict) else r for r in records]
+    results = score_records(records, compact)
+    lines = [json.dumps({"record": start + i, **res}) + "\n" for i, res in enumerate(results)]
+    return lines, sum("error" in res for res in results)
 
-print("\nCriteria Weights:")
-for c, w in zip(criteria, criteria_weights):
-    print(c, ":", round(w, 4))
-print("Consistency Ratio:", round(cr, 4))
 
-# -------- Alternative Evaluation -------- #
+def iter_chunks(records, size):
+    it = iter(records)
+    start = 0
+    while chunk := list(islice(it, size)):
+        yield start, chunk
+        start += len(chunk)
 
-alt_weights_list = []
-final_scores = np.zeros(num_alternatives)
 
-for i in range(num_criteria):
+def score_stream(records, fmt, workers=0, chunk_size=256, compact=False, defaults=None):
+    """
+    (lines, failures) per chunk, in input order. With workers > 0 chunks are
+    fanned out over a process pool, keeping at most 2 * workers chunks in
+    flight so memory stays bounded however large the input is.
+    """
+    chunks = iter_chunks(records, chunk_size)
+    if workers <= 0:
+        for start, chunk in chunks:
+            yield score_chunk(start, chunk, fmt, compact, defaults)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start, chunk in chunks:
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+            pending.append(pool.submit(score_chunk, start, chunk, fmt, compact, defaults))
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_batch(args):
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    failed = 0
+    try:
+        defaults = {k: v for k, v in (("priority_method", args.priority_method),
+                                      ("scoring_method", args.scoring_method)) if v} or None
+        for lines, errors in score_stream(read_records(source, fmt), fmt, args.workers, args.chunk_size,
+                                          args.compact, defaults):
+            sink.writelines(lines)
+            failed += errors
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    return 1 if failed else 0
+
+
+def run_screen(args):
+    """Top-k of a memory-mapped alternatives x criteria matrix, streamed in row chunks."""
+    with open(args.model, encoding="utf-8") as f:
+        model = json.load(f)
+    if args.priority_method and "priority_method" not in model:
+        model["priority_method"] = args.priority_method
+    n_criteria = len(model["criteria"])
+    try:
+        problem = {**model, "values": open_matrix(args.screen, n_criteria, args.dtype, args.offset),
+                   "variances": open_matrix(args.variances, n_criteria, args.dtype, args.offset)
+                   if args.variances else None,
+                   "top_k": args.top_k, "chunk_rows": args.chunk_rows}
+        report = screen_problem(problem)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        json.dump(report, sink)
+        sink.write("\n")
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+    return 0
 
-    print(f"\n### Evaluating Alternatives for: {criteria[i]} ###")
 
-    # ---------- OBJECTIVE ----------
-    if criteria_modes[i] == "objective":
+# ---------------- MAIN PROGRAM ---------------- #
 
-        values = []
-        for alt in alternatives:
-            v = get_valid_number(
-                f"Enter value of '{alt}' for '{criteria[i]}': "
+def interactive(priority_method="eigenvector", scoring_method="wsm"):
+    print("========== Hybrid AHP Decision System ==========\n")
+
+    decision = input("What decision are you making? ")
+
+    # -------- Criteria -------- #
+
+    num_criteria = int(input("Number of criteria: "))
+
+    criteria = []
+    criteria_types = []
+    criteria_modes = []
+
+    for i in range(num_criteria):
+
+        name = input(f"\nEnter criterion {i+1}: ")
+
+        # Benefit / Cost
+        while True:
+            print("Type?")
+            print("1. Benefit (Higher is better)")
+            print("2. Cost (Lower is better)")
+            choice = input("Enter 1 or 2: ")
+            if choice == "1":
+                ctype = "benefit"
+                break
+            elif choice == "2":
+                ctype = "cost"
+                break
+            else:
+                print("Invalid input.")
+
+        # Mode
+        while True:
+            print("Mode?")
+            print("1. Objective")
+            print("2. Subjective (Pairwise)")
+            print("3. Uncertain (Mean–Variance)")
+            mode_choice = input("Enter 1, 2 or 3: ")
+            if mode_choice == "1":
+                mode = "objective"
+                break
+            elif mode_choice == "2":
+                mode = "subjective"
+                break
+            elif mode_choice == "3":
+                mode = "uncertain"
+                break
+            else:
+                print("Invalid input.")
+
+        criteria.append(name)
+        criteria_types.append(ctype)
+        criteria_modes.append(mode)
+
+    # -------- Alternatives -------- #
+
+    num_alternatives = int(input("\nNumber of alternatives: "))
+    alternatives = [input(f"Enter alternative {i+1}: ") for i in range(num_alternatives)]
+
+    # -------- Criteria Weights (AHP) -------- #
+
+    criteria_matrix = np.ones((num_criteria, num_criteria))
+
+    print("\n=== Pairwise Comparison: Criteria Importance ===")
+
+    for i in range(num_criteria):
+        for j in range(i + 1, num_criteria):
+            value = get_valid_number(
+                f"How much is '{criteria[i]}' preferred over '{criteria[j]}'? "
             )
-            values.append(v)
+            criteria_matrix[i][j] = value
+            criteria_matrix[j][i] = 1 / value
 
-        alt_weights = normalize_objective(values, criteria_types[i])
+    criteria_weights, lambda_max = calculate_weights(criteria_matrix, priority_method=priority_method)
+    cr = consistency_ratio(num_criteria, lambda_max)
 
-    # ---------- SUBJECTIVE ----------
-    elif criteria_modes[i] == "subjective":
+    print("\nCriteria Weights:")
+    for c, w in zip(criteria, criteria_weights):
+        print(c, ":", round(w, 4))
+    print("Consistency Ratio:", round(cr, 4))
+    if priority_method in LOG_METHODS:
+        print("Geometric Consistency Index:", round(geometric_consistency_index(criteria_matrix, criteria_weights), 4))
+    if cr > CONSISTENCY_THRESHOLD:
+        suggest_repairs(criteria_matrix, criteria, priority_method)
 
-        alt_matrix = np.ones((num_alternatives, num_alternatives))
+    # -------- Alternative Evaluation -------- #
 
-        for r in range(num_alternatives):
-            for c in range(r + 1, num_alternatives):
+    alt_weights_list = []
+    final_scores = np.zeros(num_alternatives)
 
-                value = get_valid_number(
-                    f"How much is '{alternatives[r]}' preferred over '{alternatives[c]}' "
-                    f"based on '{criteria[i]}'? "
-                )
+    for i in range(num_criteria):
 
-                if criteria_types[i] == "cost":
-                    value = 1 / value
+        print(f"\n### Evaluating Alternatives for: {criteria[i]} ###")
 
-                alt_matrix[r][c] = value
-                alt_matrix[c][r] = 1 / value
+        # ---------- OBJECTIVE ----------
+        if criteria_modes[i] == "objective":
 
-        alt_weights, alt_lambda = calculate_weights(alt_matrix)
-        alt_cr = consistency_ratio(alt_matrix, alt_lambda)
-
-        print("Consistency Ratio:", round(alt_cr, 4))
-
-    # ---------- UNCERTAIN ----------
-    else:
-
-        means = []
-        variances = []
-
-        print("\nEnter Expected Value and Variance for each alternative:\n")
-
-        for alt in alternatives:
-            mean = get_valid_number(f"Expected value for '{alt}': ")
-            var = get_valid_number(f"Variance (risk) for '{alt}': ")
-            means.append(mean)
-            variances.append(var)
+            values = []
+            for alt in alternatives:
+                v = get_valid_number(
+                    f"Enter value of '{alt}' for '{criteria[i]}': "
+                )
+                values.append(v)
 
-        risk_factor = get_valid_number("\nEnter your risk tolerance (λ): ")
+            alt_weights = normalize_objective(values, criteria_types[i])
 
-        adjusted_scores = []
-        print("\nRisk Adjusted Calculations:")
+        # ---------- SUBJECTIVE ----------
+        elif criteria_modes[i] == "subjective":
 
-        for alt, m, v in zip(alternatives, means, variances):
-            adjusted = m - (risk_factor * v)
-            adjusted_scores.append(adjusted)
-            print(f"{alt}: {m} - ({risk_factor} × {v}) = {round(adjusted,4)}")
+            alt_matrix = np.ones((num_alternatives, num_alternatives))
 
-        alt_weights = normalize_shift(adjusted_scores)
+            for r in range(num_alternatives):
+                for c in range(r + 1, num_alternatives):
 
-    alt_weights_list.append(alt_weights)
-    final_scores += criteria_weights[i] * alt_weights
+                    value = get_valid_number(
+                        f"How much is '{alternatives[r]}' preferred over '{alternatives[c]}' "
+                        f"based on '{criteria[i]}'? "
+                    )
 
-# -------- Final Results -------- #
+                    if criteria_types[i] == "cost":
+                        value = 1 / value
 
-print("\n=========== FINAL RESULTS ===========\n")
+                    alt_matrix[r][c] = value
+                    alt_matrix[c][r] = 1 / value
 
-for alt, score in zip(alternatives, final_scores):
-    print(alt, ":", round(score, 4))
+            alt_weights, alt_lambda = calculate_weights(alt_matrix, priority_method=priority_method)
+            alt_cr = consistency_ratio(num_alternatives, alt_lambda)
 
-ranking = np.argsort(final_scores)[::-1]
+            print("Consistency Ratio:", round(alt_cr, 4))
+            if priority_method in LOG_METHODS:
+                print("Geometric Consistency Index:", round(geometric_consistency_index(alt_matrix, alt_weights), 4))
+            if alt_cr > CONSISTENCY_THRESHOLD:
+                # the matrix holds cost judgments already inverted, so show what the user typed
+                suggest_repairs(alt_matrix.T if criteria_types[i] == "cost" else alt_matrix, alternatives, priority_method)
 
-print("\nRanking (Best → Worst):")
-for i in ranking:
-    print(alternatives[i])
+        # ---------- UNCERTAIN ----------
+        else:
 
-print("\nRecommended Decision:", alternatives[ranking[0]])
+            means = []
+            variances = []
+
+            print("\nEnter Expected Value and Variance for each alternative:\n")
+
+            for alt in alternatives:
+                mean = get_valid_number(f"Expected value for '{alt}': ")
+                var = get_valid_number(f"Variance (risk) for '{alt}': ")
+                means.append(mean)
+                variances.append(var)
+
+            risk_factor = get_valid_number("\nEnter your risk tolerance (λ): ")
+
+            adjusted_scores = risk_adjusted(means, variances, risk_factor)
+            print("\nRisk Adjusted Calculations:")
+
+            for alt, m, v, adjusted in zip(alternatives, means, variances, adjusted_scores):
+                print(f"{alt}: {m} - ({risk_factor} × {v}) = {round(adjusted,4)}")
+
+            alt_weights = normalize_shift(adjusted_scores)
+
+        alt_weights_list.append(alt_weights)
+        final_scores += criteria_weights[i] * alt_weights
+
+    # -------- Final Results -------- #
+
+    print("\n=========== FINAL RESULTS ===========\n")
+
+    for alt, score in zip(alternatives, final_scores):
+        print(alt, ":", round(score, 4))
+
+    ranking = rank(final_scores)
+
+    print("\nRanking (Best → Worst):")
+    for i in ranking:
+        print(alternatives[i])
+
+    print("\nRecommended Decision:", alternatives[ranking[0]])
+
+    if scoring_method != "wsm":
+        compare_methods(scoring_method, criteria_weights, alt_weights_list, alternatives)
+
+    # -------- Sensitivity -------- #
+
+    sensitivity_analysis(criteria_weights, alt_weights_list, alternatives, criteria)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hybrid AHP Decision System. "
+                                                 "Interactive unless --batch or --screen is given.")
+    parser.add_argument("--batch", dest="input", metavar="FILE",
+                        help="score problems from a JSON Lines or CSV file ('-' for stdin) without prompting")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="input format (default: from the file extension)")
+    parser.add_argument("--output", default="-",
+                        help="JSON Lines output file, or the JSON report with --screen (default: stdout)")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: 0, score in-process)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="records per vectorized chunk")
+    parser.add_argument("--compact", action="store_true", help="omit detailed scores and sensitivity rows")
+    screen = parser.add_argument_group("screening", "rank a large alternatives x criteria matrix without loading it")
+    screen.add_argument("--screen", metavar="MATRIX",
+                        help=".npy or raw binary matrix (alternatives x criteria), read through a memory map")
+    screen.add_argument("--model", metavar="FILE",
+                        help="JSON with criteria, criteria_comparisons / criteria_triples / criteria_tree "
+                             "and optional risk_factors")
+    screen.add_argument("--variances", metavar="MATRIX", help="variances of the uncertain criteria, same layout")
+    screen.add_argument("--dtype", default="<f8", help="value type of raw matrices (default: <f8)")
+    screen.add_argument("--offset", type=int, default=0, help="header bytes to skip in raw matrices")
+    screen.add_argument("--top-k", type=int, default=10, help="rows to report (default: 10)")
+    screen.add_argument("--chunk-rows", type=int, default=65536, help="matrix rows per streamed chunk")
+    parser.add_argument("--priority-method", choices=PRIORITY_METHODS,
+                        help="how weights are derived from pairwise matrices (default: eigenvector; "
+                             "in batch mode only for records that do not set priority_method)")
+    parser.add_argument("--scoring-method", choices=(*SCORING_METHODS, "all"),
+                        help="aggregation method compared with the weighted sum (default: wsm; "
+                             "in batch mode only for records that do not set scoring_method)")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1 or args.workers < 0:
+        parser.error("--chunk-size must be positive and --workers non-negative")
+
+    if args.screen is not None:
+        if args.model is None:
+            parser.error("--screen needs --model")
+        if args.top_k < 1 or args.chunk_rows < 1:
+            parser.error("--top-k and --chunk-rows must be positive")
+        return run_screen(args)
+    if args.input is None:
+        interactive(args.priority_method or "eigenvector", args.scoring_method or "wsm")
+        return 0
+    return run_batch(args)
 
-# -------- Sensitivity -------- #
 
-sensitivity_analysis(criteria_weights, alt_weights_list, alternatives)
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+In-process load test of the FastAPI app.
+
+Requests go through httpx's ASGI transport, so routing, validation, the
+offload pool and JSON encoding are all measured, but no socket is involved.
+Each scenario sends `requests` requests with `concurrency` in flight. Unless a
+scenario is marked cached, every request gets a distinct decision name, so
+the response cache is missed.
+"""
+import asyncio
+import time
+
+import httpx
+import numpy as np
+
+import generators as gen
+from timing import percentiles
+
+
+def scenarios(sizes, seed: int = 0):
+    """(name, params, method, path, body factory taking the request number)."""
+    for n in sizes:
+        base = gen.problem(min(n, 50), n, "mixed", np.random.default_rng(seed + n))
+        params = {"criteria": min(n, 50), "alternatives": n}
+        yield "calculate", params, "POST", "/api/calculate", lambda k, b=base: {**b, "decision": f"load {k}"}
+        yield "calculate_cached", params, "POST", "/api/calculate", lambda k, b=base: b
+        if n <= 50:
+            comps = gen.comparisons(n, np.random.default_rng(seed)).tolist()
+            yield "validate_criteria", {"n": n}, "POST", "/api/validate-criteria", \
+                lambda k, n=n, c=comps: {"n": n, "comparisons": c, "eigen_method": "auto" if k % 2 else "power"}
+    # 20 evaluators, one of whom left a single judgment out (0)
+    evaluators = [gen.comparisons(6, np.random.default_rng(seed + e)).tolist() for e in range(20)]
+    evaluators[0][3] = 0
+    yield "group_missing", {"n": 6, "evaluators": 20}, "POST", "/api/group", \
+        lambda k, c=evaluators: {"n": 6, "comparisons": c, "priority_method": "llsm"}
+    batch = gen.problems(100, 5, 10, seed=seed)
+    yield "calculate_batch", {"problems": 100, "criteria": 5, "alternatives": 10}, "POST", "/api/calculate-batch", \
+        lambda k, b=batch: {"problems": [{**p, "decision": f"{k}"} for p in b], "compact": True}
+
+
+async def _drive(client, method, path, body, requests, concurrency):
+    latencies, statuses = [], {}
+    queue = iter(range(requests))
+
+    async def worker():
+        for k in queue:
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body(k))
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - start
+
+
+async def _run(app, sizes, requests, concurrency, seed):
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, params, method, path, body in scenarios(sizes, seed):
+            await client.request(method, path, json=body(-1))   # warm-up
+            latencies, statuses, wall = await _drive(client, method, path, body, requests, concurrency)
+            ms = [t * 1e3 for t in latencies]
+            results.append({"suite": "api", "name": name, "params": {**params, "requests": requests,
+                                                                      "concurrency": concurrency},
+                            "throughput_rps": requests / wall, "mean_ms": sum(ms) / len(ms),
+                            **{f"{k}_ms": v for k, v in percentiles(ms).items()},
+                            "status": {str(k): v for k, v in sorted(statuses.items())}})
+    return results
+
+
+def run(app, sizes, requests: int = 200, concurrency: int = 8, seed: int = 0) -> list:
+    return asyncio.run(_run(app, sizes, requests, concurrency, seed))
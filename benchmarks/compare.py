@@ -0,0 +1,59 @@
+"""
+Compare two benchmark result files case by case.
+
+    python benchmarks/compare.py before.json after.json [--threshold 0.10]
+
+Engine cases are compared on best_us and API cases on p50_ms. A ratio above
+1 + threshold is flagged as slower and one below 1 - threshold as faster. The
+exit code is 1 if anything got slower, so the script can gate CI.
+"""
+import argparse
+import json
+import sys
+
+
+def metric(record: dict):
+    return ("best_us", record["best_us"]) if "best_us" in record else ("p50_ms", record["p50_ms"])
+
+
+def key(record: dict) -> tuple:
+    return record["suite"], record["name"], json.dumps(record["params"], sort_keys=True)
+
+
+def compare(before: dict, after: dict, threshold: float = 0.10):
+    old = {key(r): r for r in before["results"]}
+    rows = []
+    for record in after["results"]:
+        previous = old.get(key(record))
+        if previous is None:
+            continue
+        unit, new = metric(record)
+        _, base = metric(previous)
+        ratio = new / base if base else float("inf")
+        verdict = "slower" if ratio > 1 + threshold else "faster" if ratio < 1 - threshold else ""
+        rows.append((key(record), unit, base, new, ratio, verdict))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON files")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change that counts (default 0.10)")
+    args = parser.parse_args(argv)
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    rows = compare(before, after, args.threshold)
+    print(f"before {before['meta'].get('commit')}  after {after['meta'].get('commit')}")
+    for (suite, name, params), unit, base, new, ratio, verdict in rows:
+        print(f"{suite:9s} {name:26s} {params:60s} {base:12.2f} -> {new:12.2f} {unit:7s} x{ratio:5.2f} {verdict}")
+    slower = sum(1 for row in rows if row[-1] == "slower")
+    print(f"{len(rows)} cases, {slower} slower, {sum(1 for row in rows if row[-1] == 'faster')} faster")
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Micro-benchmarks of the ahp_engine functions, one case per (function, size).
+
+Every case is (name, params, fn); fn takes no arguments and all inputs are
+generated up front, so only the engine call is timed.
+"""
+import itertools
+
+import numpy as np
+
+import generators as gen
+from ahp_engine import (PRIORITY_METHODS, DecisionSession, build_matrix, calculate_weights, consistency_ratio,
+                        evaluate, evaluate_batch, group_prioritize, normalize_objective, normalize_shift,
+                        perturbation_scores, promethee, repair_suggestions, risk_adjusted, simulate,
+                        sparse_prioritize, stability_intervals, topsis, vikor)
+
+SIZES = (3, 5, 10, 20, 50, 100, 200)
+ITERATIVE_EIGEN = ("eig", "power", "rqi", "log_eigh")
+
+
+def matrix_cases(sizes, rng):
+    for n in sizes:
+        comps = gen.comparisons(n, rng)
+        m = gen.matrix(n, rng)
+        yield "build_matrix", {"n": n}, lambda n=n, c=comps: build_matrix(n, c)
+        for method in PRIORITY_METHODS:
+            yield "calculate_weights", {"n": n, "priority_method": method}, \
+                lambda m=m, p=method: calculate_weights(m, "auto", p)
+        for eigen in ITERATIVE_EIGEN:
+            yield "calculate_weights", {"n": n, "eigen_method": eigen}, lambda m=m, e=eigen: calculate_weights(m, e)
+        yield "consistency_ratio", {"n": n}, lambda n=n: consistency_ratio(n, n + 0.5)
+        if n <= 20:
+            stack = gen.matrix_stack(1000, n, rng)
+            yield "calculate_weights_stacked", {"n": n, "batch": 1000}, lambda s=stack: calculate_weights(s)
+
+
+def scoring_cases(sizes, rng):
+    for n in sizes:
+        values = rng.uniform(1.0, 100.0, n)
+        variances = rng.uniform(0.0, 25.0, n)
+        yield "normalize_objective", {"n": n}, lambda v=values: normalize_objective(v, "cost")
+        yield "normalize_shift", {"n": n}, lambda v=values: normalize_shift(v - 50.0)
+        yield "risk_adjusted", {"n": n}, lambda v=values, s=variances: risk_adjusted(v, s, 1.0)
+        cw = rng.dirichlet(np.ones(n))
+        aw = rng.dirichlet(np.ones(n), size=n)
+        yield "perturbation_scores", {"criteria": n, "alternatives": n}, lambda c=cw, a=aw: perturbation_scores(c, a)
+        yield "stability_intervals", {"criteria": n, "alternatives": n}, \
+            lambda c=cw, a=aw: stability_intervals(c, a, full_ranking=True)
+        yield "topsis", {"criteria": n, "alternatives": n}, lambda c=cw, a=aw: topsis(c, a)
+        yield "vikor", {"criteria": n, "alternatives": n}, lambda c=cw, a=aw: vikor(c, a)
+        yield "promethee", {"criteria": n, "alternatives": n}, lambda c=cw, a=aw: promethee(c, a)
+        yield "promethee_blocked", {"criteria": n, "alternatives": n}, lambda c=cw, a=aw: promethee(c, a, 0.05, 0.5)
+
+
+def pipeline_cases(sizes, rng):
+    for n in sizes:
+        for mode in gen.MODES:
+            p = gen.problem(n, n, mode, rng)
+            yield "evaluate", {"criteria": n, "alternatives": n, "mode": mode}, lambda p=p: evaluate(p)
+    for count, size in ((100, 5), (1000, 5), (100, 20)):
+        batch = gen.problems(count, size, size, seed=int(rng.integers(1 << 31)))
+        yield "evaluate_batch", {"problems": count, "criteria": size, "alternatives": size}, \
+            lambda b=batch: evaluate_batch(b, compact=True)
+    p = gen.problem(5, 10, "mixed", rng)
+    yield "simulate", {"criteria": 5, "alternatives": 10, "n_draws": 10000}, \
+        lambda p=p: simulate(10, p["criteria_comparisons"], p["criteria"], p["alt_data"], p["uncertain_data"],
+                             n_draws=10000, seed=0)
+
+
+def feature_cases(sizes, rng):
+    for n in sizes:
+        # a spanning chain plus ~3 extra comparisons per item
+        chain = [(k, k + 1) for k in range(n - 1)]
+        extra = {tuple(sorted(map(int, rng.choice(n, 2, replace=False)))) for _ in range(3 * n)} - set(chain)
+        triples = [(i, j, float(rng.choice(gen.SAATY_SCALE))) for i, j in chain + sorted(extra)]
+        for method in ("llsm", "harker"):
+            yield "sparse_prioritize", {"n": n, "edges": len(triples), "method": method}, \
+                lambda n=n, t=triples, m=method: sparse_prioritize(n, t, m)
+        if n <= 50:
+            m = gen.matrix(n, rng, "random")
+            yield "repair_suggestions", {"n": n}, lambda m=m: repair_suggestions(m)
+            group = np.stack([gen.comparisons(n, rng) for _ in range(1000)])
+            yield "group_prioritize", {"n": n, "evaluators": 1000}, lambda n=n, g=group: group_prioritize(g, n)
+        if n <= 100:
+            session = DecisionSession(gen.problem(n, n, "subjective", rng))
+            deltas = [{"criterion": int(k), "i": 0, "j": 1, "value": float(v)}
+                      for k, v in zip(rng.integers(0, n, 64), rng.choice(gen.SAATY_SCALE, 64))]
+            cycle = itertools.cycle(deltas)
+            yield "session_apply", {"criteria": n, "alternatives": n}, lambda s=session, d=cycle: s.apply(next(d))
+
+
+SUITES = {"matrix": matrix_cases, "scoring": scoring_cases, "pipeline": pipeline_cases, "features": feature_cases}
+
+
+def cases(sizes=SIZES, suites=tuple(SUITES), seed: int = 0):
+    rng = np.random.default_rng(seed)
+    for suite in suites:
+        for name, params, fn in SUITES[suite](sizes, rng):
+            yield suite, name, params, fn
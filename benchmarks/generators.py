@@ -0,0 +1,70 @@
+"""
+Synthetic AHP problems for the benchmarks.
+
+Matrices are built from a random priority vector w: a consistent matrix has
+a_ij = w_i / w_j exactly, a near-consistent one multiplies each upper-triangle
+entry by exp(N(0, noise)), and a random one draws every judgment from the Saaty
+scale. Problems come in the AHPRequest layout, so they can go to the engine
+or be posted to the API as they are.
+"""
+import numpy as np
+
+SAATY_SCALE = np.array([1/9, 1/8, 1/7, 1/6, 1/5, 1/4, 1/3, 1/2, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+MODES = ("objective", "subjective", "uncertain", "mixed")
+CONSISTENCY = ("consistent", "near", "random")
+
+
+def comparisons(n: int, rng: np.random.Generator, consistency: str = "near", noise: float = 0.2) -> np.ndarray:
+    """Row-major upper triangle of an n x n reciprocal matrix."""
+    iu, ju = np.triu_indices(n, k=1)
+    if consistency == "random":
+        return rng.choice(SAATY_SCALE, iu.size)
+    w = np.exp(rng.uniform(0.0, np.log(9.0), n))
+    values = w[iu] / w[ju]
+    if consistency == "near":
+        values = values * np.exp(rng.normal(0.0, noise, iu.size))
+    return np.clip(values, 1 / 9, 9)
+
+
+def matrix(n: int, rng: np.random.Generator, consistency: str = "near") -> np.ndarray:
+    iu, ju = np.triu_indices(n, k=1)
+    m = np.ones((n, n))
+    m[iu, ju] = comparisons(n, rng, consistency)
+    m[ju, iu] = 1.0 / m[iu, ju]
+    return m
+
+
+def matrix_stack(batch: int, n: int, rng: np.random.Generator, consistency: str = "near") -> np.ndarray:
+    return np.stack([matrix(n, rng, consistency) for _ in range(batch)])
+
+
+def problem(n_criteria: int, n_alt: int, mode: str = "mixed", rng: np.random.Generator = None,
+            consistency: str = "near") -> dict:
+    """One problem; mode "mixed" cycles objective / subjective / uncertain over the criteria."""
+    rng = rng or np.random.default_rng(0)
+    modes = [MODES[k % 3] for k in range(n_criteria)] if mode == "mixed" else [mode] * n_criteria
+    criteria, alt_data, uncertain = [], [], []
+    for k, m in enumerate(modes):
+        criteria.append({"name": f"c{k}", "type": "cost" if k % 4 == 3 else "benefit", "mode": m})
+        if m == "subjective":
+            alt_data.append(comparisons(n_alt, rng, consistency).tolist())
+            uncertain.append(None)
+        else:
+            means = rng.uniform(1.0, 100.0, n_alt).tolist()
+            alt_data.append(means)
+            uncertain.append({"means": means, "variances": rng.uniform(0.0, 25.0, n_alt).tolist(),
+                              "risk_factor": 1.0} if m == "uncertain" else None)
+    return {
+        "decision": f"bench {n_criteria}x{n_alt} {mode}",
+        "criteria": criteria,
+        "alternatives": [f"a{j}" for j in range(n_alt)],
+        "criteria_comparisons": comparisons(n_criteria, rng, consistency).tolist(),
+        "alt_data": alt_data,
+        "uncertain_data": uncertain,
+    }
+
+
+def problems(count: int, n_criteria: int, n_alt: int, mode: str = "mixed", seed: int = 0,
+             consistency: str = "near") -> list:
+    rng = np.random.default_rng(seed)
+    return [problem(n_criteria, n_alt, mode, rng, consistency) for _ in range(count)]
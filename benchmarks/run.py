@@ -0,0 +1,100 @@
+"""
+Benchmark runner: engine micro-benchmarks and the in-process API load test.
+
+    python benchmarks/run.py                          # everything, sizes 3..200
+    python benchmarks/run.py --quick                  # sizes 3, 10, 50; fewer requests
+    python benchmarks/run.py --suite matrix scoring --sizes 5 50 --output before.json
+    python benchmarks/compare.py before.json after.json
+
+Results are one JSON document: run metadata (commit, versions, machine) plus
+one record per case. Times are in microseconds for the engine cases and in
+milliseconds for the API cases.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "Website"))
+
+import numpy as np
+
+import engine
+from timing import measure
+
+QUICK_SIZES = (3, 10, 50)
+
+
+def metadata() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, timeout=10).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return None
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "python": platform.python_version(),
+            "numpy": np.__version__, "platform": platform.platform(), "cpus": os.cpu_count()}
+
+
+def run_engine(sizes, suites, repeat, min_time, seed, log) -> list:
+    results = []
+    for suite, name, params, fn in engine.cases(sizes, suites, seed):
+        timing = measure(fn, repeat=repeat, min_time=min_time)
+        results.append({"suite": suite, "name": name, "params": params, **timing})
+        log(f"{suite:9s} {name:26s} {json.dumps(params):60s} {timing['best_us']:12.1f} us")
+    return results
+
+
+def run_api(sizes, requests, concurrency, seed, log) -> list:
+    import api
+    # queue room for every in-flight request, so latency is measured rather than 429s;
+    # export AHP_OFFLOAD_MAX_QUEUE to benchmark load shedding instead
+    os.environ.setdefault("AHP_OFFLOAD_MAX_QUEUE", str(concurrency))
+    from main import OFFLOAD, app
+    try:
+        results = api.run(app, sizes, requests, concurrency, seed)
+    finally:
+        OFFLOAD.shutdown()
+    for r in results:
+        log(f"api       {r['name']:26s} {json.dumps(r['params']):60s} p50 {r['p50_ms']:8.2f} ms  "
+            f"p99 {r['p99_ms']:8.2f} ms  {r['throughput_rps']:8.1f} req/s")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AHP engine and API benchmarks")
+    parser.add_argument("--suite", nargs="+", choices=(*engine.SUITES, "api"), default=(*engine.SUITES, "api"))
+    parser.add_argument("--sizes", nargs="+", type=int, help=f"matrix / problem sizes (default {engine.SIZES})")
+    parser.add_argument("--quick", action="store_true", help=f"sizes {QUICK_SIZES}, shorter rounds, 50 requests")
+    parser.add_argument("--repeat", type=int, default=5, help="timing rounds per engine case")
+    parser.add_argument("--requests", type=int, help="requests per API scenario (default 200)")
+    parser.add_argument("--concurrency", type=int, default=8, help="API requests in flight")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", "-o", help="write the JSON results here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    sizes = tuple(args.sizes or (QUICK_SIZES if args.quick else engine.SIZES))
+    min_time = 0.005 if args.quick else 0.02
+    requests = args.requests or (50 if args.quick else 200)
+    log = lambda line: print(line, file=sys.stderr)
+
+    engine_suites = [s for s in args.suite if s != "api"]
+    results = run_engine(sizes, engine_suites, args.repeat, min_time, args.seed, log) if engine_suites else []
+    if "api" in args.suite:
+        results += run_api(sizes, requests, args.concurrency, args.seed, log)
+
+    document = {"meta": {**metadata(), "sizes": list(sizes), "seed": args.seed}, "results": results}
+    payload = json.dumps(document, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Small timeit-style helper shared by the benchmark suites."""
+import statistics
+import time
+
+
+def measure(fn, repeat: int = 5, min_time: float = 0.02, max_calls: int = 100_000) -> dict:
+    """
+    Per-call time of fn() in microseconds. The number of calls per round grows
+    until a round takes min_time; best of `repeat` rounds is the headline number.
+    """
+    fn()   # warm-up: imports, caches, lazily built tables
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or calls >= max_calls:
+            break
+        calls = min(max_calls, calls * max(2, int(min_time / max(elapsed, 1e-9))))
+    rounds = [elapsed / calls]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        rounds.append((time.perf_counter() - start) / calls)
+    return {"calls": calls, "rounds": repeat, "best_us": min(rounds) * 1e6,
+            "median_us": statistics.median(rounds) * 1e6, "mean_us": statistics.fmean(rounds) * 1e6}
+
+
+def percentiles(samples, points=(50, 90, 95, 99)) -> dict:
+    ordered = sorted(samples)
+    if not ordered:
+        return {f"p{p}": None for p in points}
+    return {f"p{p}": ordered[min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))] for p in points}